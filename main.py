@@ -4,35 +4,118 @@ Main entrypoint for The Dyrt web scraper case study.
 Usage:
     The scraper can be run directly (`python main.py`) or via Docker Compose (`docker compose up`).
 
+    python main.py                          # Full US bounding box, 10 page limit
+    python main.py --region western_us      # One predefined region
+    python main.py --full-us --max-pages 5  # 4 main US regions scanned in parallel
+    python main.py --max-pages 0            # No page limit
+    python main.py --log-level DEBUG        # Also log every page request
+
 If you have any questions in mind you can connect to me directly via info@smart-maple.com
 """
+import argparse
+import logging
+
 from src.db.database import create_tables
-from src.scraper.dyrt_scraper import main as run_scraper
+from src.scraper.dyrt_scraper import REGION_BOUNDS, US_BOUNDS, main as run_scraper
+from src.utils.logging_config import setup_logging
 
-def main():
+logger = logging.getLogger(__name__)
+
+def positive_int(value):
+    """
+    argparse type for options that must be at least 1.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+def non_negative_int(value):
+    """
+    argparse type for options where 0 has a meaning of its own (e.g. no limit).
+    """
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be zero or a positive integer, got {value}")
+    return number
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments for a scraper run.
+    """
+    parser = argparse.ArgumentParser(description="Scrape campgrounds from The Dyrt into PostgreSQL.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
+        "--region",
+        choices=list(REGION_BOUNDS),
+        help="Predefined region to scan (default: the full US bounding box)"
+    )
+    target.add_argument(
+        "--full-us",
+        action="store_true",
+        help="Scan the 4 main US regions in parallel"
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=non_negative_int,
+        default=10,
+        help="Maximum number of pages per region, 0 for no limit (default: 10)"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=positive_int,
+        default=4,
+        help="Maximum number of regions scanned concurrently with --full-us (default: 4)"
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="Log level; per-page and per-request messages are only shown at DEBUG (default: INFO)"
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Main function to run the scraper.
     """
+    args = parse_args(argv)
+    logging.getLogger().setLevel(args.log_level)
+    max_pages = args.max_pages if args.max_pages > 0 else None
+    bbox = REGION_BOUNDS[args.region] if args.region else US_BOUNDS
+    page_limit = f"limited to {max_pages} pages" if max_pages is not None else "no page limit"
+    
     try:
         # Initialize database tables
         create_tables()
         
-        # Run full US scan with 10 page limit
-        print("Starting US scan to collect campgrounds (limited to 10 pages)...")
-        total_raw, total_processed, inserted, updated = run_scraper(max_pages=10)
+        if args.full_us:
+            logger.info("Starting parallel US scan to collect campgrounds (%s)...", page_limit)
+        else:
+            logger.info("Starting %s scan to collect campgrounds (%s)...", args.region or "US", page_limit)
+        total_raw, total_processed, inserted, updated = run_scraper(
+            max_pages=max_pages,
+            bbox=bbox,
+            parallel=args.full_us,
+            max_workers=args.max_workers
+        )
         
-        print(f"\nScan completed successfully")
-        print(f"  Total campgrounds found: {total_raw}")
-        print(f"  Total campgrounds processed: {total_processed}")
-        print(f"  Campgrounds inserted: {inserted}")
-        print(f"  Campgrounds updated: {updated}")
+        logger.info("Scan completed successfully")
+        logger.info("  Total campgrounds found: %d", total_raw)
+        logger.info("  Total campgrounds processed: %d", total_processed)
+        logger.info("  Campgrounds inserted: %d", inserted)
+        logger.info("  Campgrounds updated: %d", updated)
         
         return 0
     except Exception as e:
-        print(f"An error occurred in the main function: {str(e)}")
+        logger.error("An error occurred in the main function: %s", e)
         return 1
 
 
 if __name__ == "__main__":
-    exit_code = main()
-    print(f"Exiting with code {exit_code}")
+    log_listener = setup_logging()
+    try:
+        exit_code = main()
+        logger.info("Exiting with code %d", exit_code)
+    finally:
+        log_listener.stop()
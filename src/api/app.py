@@ -1,130 +1,74 @@
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
-from sqlalchemy.orm import Session
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, Field
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+import hashlib
+import httpx
 import logging
+import orjson
+from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Optional, List
-import concurrent.futures
-import time
 
-from src.db.database import get_db, CampgroundDB
-from src.scraper.dyrt_scraper import (
-    US_BOUNDS, WESTERN_US_BOUNDS, EASTERN_US_BOUNDS,
-    MIDWEST_US_BOUNDS, SOUTHERN_US_BOUNDS, PACIFIC_NW_BOUNDS, SOUTHWEST_US_BOUNDS,
-    NORTHEAST_US_BOUNDS, SOUTHEAST_US_BOUNDS, FOUR_MAIN_US_REGIONS
-)
-from src.scraper.dyrt_scraper import main as run_scraper, scrape_region, parallel_scrape_regions
-from src.geocoding.nominatim import get_address_from_coordinates, batch_geocode
+from src.db.database import get_db, CampgroundDB, GeocodeCache
+from src.models.campground import CampgroundSummary
+from src.scraper.dyrt_scraper import US_BOUNDS, FOUR_MAIN_US_REGIONS, REGION_BOUNDS, format_bbox
+from src.geocoding.nominatim import get_address_from_coordinates_async, quantize_coordinates
+from src.api import tasks
+from src.utils.logging_config import setup_logging
 
-# Configure logging - Adjust format to remove INFO/WARNING prefixes
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(message)s",
-    handlers=[logging.StreamHandler()]
-)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app):
+    # Logging is configured here rather than at import, with a queue so handlers never block requests
+    log_listener = setup_logging()
+    
+    # One HTTP client for the whole app, so outbound calls reuse pooled keep-alive connections
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        http2=True,
+        timeout=httpx.Timeout(10)
+    )
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+        tasks.shutdown()
+        log_listener.stop()
+
 app = FastAPI(
     title="Campground Scraper API",
     description="Simple API for scraping and retrieving campground data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Map of predefined bounding boxes
-BBOX_MAP = {
-    "us": US_BOUNDS,
-    "western_us": WESTERN_US_BOUNDS,
-    "eastern_us": EASTERN_US_BOUNDS,
-    "midwest_us": MIDWEST_US_BOUNDS,
-    "southern_us": SOUTHERN_US_BOUNDS,
-    "pacific_northwest": PACIFIC_NW_BOUNDS,
-    "southwest_us": SOUTHWEST_US_BOUNDS,
-    "northeast_us": NORTHEAST_US_BOUNDS,
-    "southeast_us": SOUTHEAST_US_BOUNDS
-}
+# Map of predefined bounding boxes (read-only, shared with the CLI)
+BBOX_MAP = REGION_BOUNDS
 
-# Background task for scraping
-def scrape_campgrounds_task(bbox= US_BOUNDS, max_pages = None):
-    try:
-        region_name = "Full US" if bbox == US_BOUNDS else f"Region with bbox: {bbox}"
-        page_limit = f"with page limit: {max_pages}" if max_pages is not None else "without page limit (auto-collection)"
-        
-        logger.info(f"Starting: Scanning {region_name} {page_limit}")
-        total_raw, total_processed, inserted, updated = run_scraper(max_pages=max_pages, bbox=bbox)
-        logger.info(f"Completed: Found {total_raw} campgrounds, processed {total_processed}, inserted {inserted}, updated {updated}")
-    except Exception as e:
-        logger.error(f"Error occurred: {str(e)}")
+# Error message parts are constant, so format them once instead of per request
+_REGION_LIST_STR = ", ".join(BBOX_MAP)
+_REGION_ERROR = f"Invalid region. Please choose from: {_REGION_LIST_STR} or provide a custom bbox parameter"
 
-# Background task for updating addresses
-def update_addresses_task(limit = 100, max_workers = 8):
-    db = get_db()
-    try:
-        # Get campgrounds that don't have an address but have coordinates
-        query = db.query(CampgroundDB).filter(
-            CampgroundDB.address == None,  # No address
-            CampgroundDB.latitude != None,  # Has latitude
-            CampgroundDB.longitude != None  # Has longitude
-        ).limit(limit)
-        
-        campgrounds = query.all()
-        logger.info(f"Found {len(campgrounds)} campgrounds without address. Starting parallel geocoding with {max_workers} workers...")
-        
-        coords_list = [(c.latitude, c.longitude) for c in campgrounds]
-        address_count = 0
-        
-        # Process all coordinates in a single batch using parallel geocoding
-        start_time = time.time()
-        addresses = batch_geocode(coords_list, max_workers=max_workers)
-        end_time = time.time()
-        
-        # Update campgrounds with new addresses
-        for i, campground in enumerate(campgrounds):
-            coord_key = coords_list[i]
-            if coord_key in addresses and addresses[coord_key]:
-                campground.address = addresses[coord_key]
-                address_count += 1
-        
-        # Commit all updates at once
-        db.commit()
-        
-        # Calculate performance stats
-        duration = end_time - start_time
-        processing_speed = len(coords_list) / duration if duration > 0 else 0
-        
-        logger.info(f"Address update completed: {address_count} addresses added in {duration:.1f} seconds")
-        logger.info(f"Geocoding performance: {processing_speed:.2f} coordinates/second with {max_workers} workers")
-        
-        return {
-            "success": True, 
-            "addresses_updated": address_count,
-            "processing_time_seconds": duration,
-            "processing_speed": f"{processing_speed:.2f} coordinates/second"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error updating addresses: {str(e)}")
-        db.rollback()
-        return {"success": False, "error": str(e)}
-    finally:
-        db.close()
+# The /regions payload never changes at runtime, so serialize it and its ETag once
+_REGIONS_JSON = orjson.dumps({"regions": list(BBOX_MAP), "full_us_available": True})
+_REGIONS_ETAG = f'W/"{hashlib.md5(_REGIONS_JSON).hexdigest()}"'
+_REGIONS_HEADERS = {"Cache-Control": "public, max-age=86400", "ETag": _REGIONS_ETAG}
 
-# Background task for parallel multi-region scraping
-def scrape_multiregion_task(regions=FOUR_MAIN_US_REGIONS, max_pages=None, max_workers=4):
-    try:
-        logger.info(f"Starting parallel scan across {len(regions)} regions with {max_workers} workers")
-        
-        # Call the parallel scraper function
-        total_raw, total_processed, total_inserted, total_updated = parallel_scrape_regions(
-            regions=regions,
-            max_pages=max_pages,
-            max_workers=max_workers
-        )
-        
-        logger.info(f"Completed multiregion scan: {total_raw} found, {total_processed} processed, "
-                   f"{total_inserted} inserted, {total_updated} updated")
-        
-        return total_raw, total_processed, total_inserted, total_updated
-    except Exception as e:
-        logger.error(f"Error in multiregion scan: {str(e)}")
-        return 0, 0, 0, 0
+class MultiRegionBody(BaseModel):
+    """
+    Request body for /scrape-multiregion.
+    """
+    regions: Optional[List[str]] = None
+    max_pages: Optional[int] = None
+    max_workers: int = Field(4, ge=1)
+
+def escape_like(value):
+    """Escape LIKE wildcards so user input is matched literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 @app.get("/")
 def read_root():
@@ -132,7 +76,6 @@ def read_root():
 
 @app.post("/scrape")
 async def scrape_campgrounds(
-    background_tasks: BackgroundTasks,
     max_pages: Optional[int] = None,
     region: Optional[str] = None,
     bbox: Optional[str] = None
@@ -143,22 +86,22 @@ async def scrape_campgrounds(
         
         # If region is specified but not bbox, convert region to bbox
         if not bounding_box and region:
-            if region in BBOX_MAP:
-                bounding_box = BBOX_MAP[region]
-            elif region.lower() == "us":
-                bounding_box = US_BOUNDS
-            else:
-                return {
-                    "status": "error",
-                    "message": f"Invalid region. Please choose from: {', '.join(BBOX_MAP.keys())} or provide a custom bbox parameter"
-                }
+            bounding_box = BBOX_MAP.get(region)
+            if bounding_box is None:
+                if region.lower() == "us":
+                    bounding_box = US_BOUNDS
+                else:
+                    return {
+                        "status": "error",
+                        "message": _REGION_ERROR
+                    }
         
         # If no region or bbox specified, default to US_BOUNDS
         if not bounding_box:
             bounding_box = US_BOUNDS
         
         # Start the scraper in the background
-        background_tasks.add_task(scrape_campgrounds_task, bounding_box, max_pages)
+        tasks.submit(tasks.scrape_campgrounds_task, bounding_box, max_pages)
         
         # Prepare the response message
         if bounding_box == US_BOUNDS:
@@ -166,22 +109,21 @@ async def scrape_campgrounds(
         elif region in BBOX_MAP:
             response_message = f"Scan started: region={region}"
         else:
-            response_message = f"Scan started: bbox={bounding_box}"
+            response_message = f"Scan started: bbox={format_bbox(bounding_box)}"
             
         return {
             "message": response_message,
             "status": "processing",
             "auto_collection": True if max_pages is None else False,
             "max_pages": max_pages,
-            "bbox": bounding_box
+            "bbox": format_bbox(bounding_box)
         }
     except Exception as e:
-        logger.error(f"Error starting scan: {str(e)}")
+        logger.error("Error starting scan: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/update-addresses")
 async def update_addresses(
-    background_tasks: BackgroundTasks,
     limit: int = 100,
     max_workers: int = 8
 ):
@@ -194,168 +136,171 @@ async def update_addresses(
         max_workers: Number of parallel workers for geocoding (default: 8)
     """
     try:
-        background_tasks.add_task(update_addresses_task, limit, max_workers)
+        tasks.submit(tasks.update_addresses_task, limit, max_workers)
         return {
             "message": f"Address update task started for up to {limit} campgrounds using {max_workers} parallel workers",
             "status": "processing"
         }
     except Exception as e:
-        logger.error(f"Error starting address update: {str(e)}")
+        logger.error("Error starting address update: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/campgrounds")
-def get_campgrounds(
-    db: Session = Depends(get_db),
+@app.get("/campgrounds", response_model=List[CampgroundSummary], response_model_exclude_none=True)
+async def get_campgrounds(
+    db: AsyncSession = Depends(get_db),
     limit: int = 20,
     region: Optional[str] = None
 ):
     try:
-        # Base query
-        query = db.query(CampgroundDB)
+        # Only select the columns returned to the client, not the wide ARRAY fields
+        stmt = select(
+            CampgroundDB.id,
+            CampgroundDB.name,
+            CampgroundDB.region_name,
+            CampgroundDB.rating,
+            CampgroundDB.price_low,
+            CampgroundDB.price_high
+        )
         
-        # Filter by region if specified
+        # Filter by region if specified. Wildcards in the input are escaped so the
+        # substring match stays a plain lookup on the region_name trigram index.
         if region:
-            query = query.filter(CampgroundDB.region_name.ilike(f"%{region}%"))
-        
-        # Get the most recent campgrounds
-        campgrounds = query.limit(limit).all()
-        
-        # Convert to simple list of dictionaries
-        result = []
-        for campground in campgrounds:
-            camp_dict = {
-                "id": campground.id,
-                "name": campground.name,
-                "region_name": campground.region_name,
-                "rating": campground.rating,
-                "price_low": campground.price_low,
-                "price_high": campground.price_high,
-            }
-            result.append(camp_dict)
+            stmt = stmt.where(CampgroundDB.region_name.ilike(f"%{escape_like(region)}%", escape="\\"))
         
-        return result
+        # Rows are validated into CampgroundSummary by the response model, nulls are dropped
+        result = await db.execute(stmt.limit(limit))
+        return result.mappings().all()
     except Exception as e:
-        logger.error(f"Error retrieving campgrounds: {str(e)}")
+        logger.error("Error retrieving campgrounds: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/campgrounds/{campground_id}")
-def get_campground(campground_id: str, db: Session = Depends(get_db)):
+async def get_campground(campground_id: str, db: AsyncSession = Depends(get_db)):
     try:
-        campground = db.query(CampgroundDB).filter(CampgroundDB.id == campground_id).first()
+        # Select only the essential fields as a Core row, its mapping is already dict-like
+        result = await db.execute(
+            select(
+                CampgroundDB.id,
+                CampgroundDB.name,
+                CampgroundDB.region_name,
+                CampgroundDB.latitude,
+                CampgroundDB.longitude,
+                CampgroundDB.rating,
+                CampgroundDB.price_low,
+                CampgroundDB.price_high,
+                CampgroundDB.photo_url,
+                CampgroundDB.operator,
+                CampgroundDB.address
+            ).where(CampgroundDB.id == campground_id)
+        )
+        campground = result.mappings().first()
         
-        if not campground:
+        if campground is None:
             raise HTTPException(status_code=404, detail="Campground not found")
         
-        # Convert to dictionary with only essential fields
-        result = {
-            "id": campground.id,
-            "name": campground.name,
-            "region_name": campground.region_name,
-            "latitude": campground.latitude,
-            "longitude": campground.longitude,
-            "rating": campground.rating,
-            "price_low": campground.price_low,
-            "price_high": campground.price_high,
-            "photo_url": campground.photo_url,
-            "operator": campground.operator,
-            "address": campground.address
-        }
-        
-        return result
+        return dict(campground)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving campground {campground_id}: {str(e)}")
+        logger.error("Error retrieving campground %s: %s", campground_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/campgrounds/{campground_id}/detailed")
-def get_campground_detailed(campground_id: str, db: Session = Depends(get_db)):
+async def get_campground_detailed(campground_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     """Get detailed information about a specific campground, including its address"""
     try:
-        campground = db.query(CampgroundDB).filter(CampgroundDB.id == campground_id).first()
+        # Read the row as a plain mapping, no ORM instance is needed to build the response
+        result = await db.execute(
+            select(CampgroundDB.__table__).where(CampgroundDB.id == campground_id)
+        )
+        campground = result.mappings().first()
         
         if not campground:
             raise HTTPException(status_code=404, detail="Campground not found")
             
         # Get address from geocoding if not already present
-        address = campground.address
-        if not address and campground.latitude and campground.longitude:
+        address = campground["address"]
+        latitude = campground["latitude"]
+        longitude = campground["longitude"]
+        if not address and latitude and longitude:
             try:
-                address = get_address_from_coordinates(campground.latitude, campground.longitude)
+                # Nearby campgrounds share a cached address, check it before calling Nominatim
+                lat_q, lon_q = quantize_coordinates(latitude, longitude)
+                cached = await db.get(GeocodeCache, (lat_q, lon_q))
+                if cached and cached.address:
+                    address = cached.address
+                else:
+                    address = await get_address_from_coordinates_async(
+                        latitude, longitude, request.app.state.http
+                    )
+                    if address:
+                        await db.merge(GeocodeCache(
+                            lat_q=lat_q, lon_q=lon_q, address=address, fetched_at=datetime.utcnow()
+                        ))
                 if address:
                     # Save the address to the database for future queries
-                    campground.address = address
-                    db.commit()
+                    await db.execute(
+                        update(CampgroundDB).where(CampgroundDB.id == campground_id).values(address=address)
+                    )
+                    await db.commit()
             except Exception as e:
-                logger.error(f"Error geocoding address: {str(e)}")
-        
-        # Convert to dictionary with all fields
-        result = {
-            "id": campground.id,
-            "name": campground.name,
-            "type": campground.type,
-            "links_self": campground.links_self,
-            "region_name": campground.region_name,
-            "administrative_area": campground.administrative_area,
-            "nearest_city_name": campground.nearest_city_name,
-            "accommodation_type_names": campground.accommodation_type_names,
-            "bookable": campground.bookable,
-            "camper_types": campground.camper_types,
-            "operator": campground.operator,
+                logger.error("Error geocoding address: %s", e)
+        
+        # Serialize straight to JSON with orjson, skipping FastAPI's jsonable_encoder pass
+        return ORJSONResponse({
+            "id": campground["id"],
+            "name": campground["name"],
+            "type": campground["type"],
+            "links_self": campground["links_self"],
+            "region_name": campground["region_name"],
+            "administrative_area": campground["administrative_area"],
+            "nearest_city_name": campground["nearest_city_name"],
+            "accommodation_type_names": campground["accommodation_type_names"],
+            "bookable": campground["bookable"],
+            "camper_types": campground["camper_types"],
+            "operator": campground["operator"],
             "location": {
-                "latitude": campground.latitude,
-                "longitude": campground.longitude,
+                "latitude": latitude,
+                "longitude": longitude,
                 "address": address
             },
             "photos": {
-                "main_photo": campground.photo_url,
-                "all_photos": campground.photo_urls,
-                "count": campground.photos_count
+                "main_photo": campground["photo_url"],
+                "all_photos": campground["photo_urls"],
+                "count": campground["photos_count"]
             },
             "ratings": {
-                "rating": campground.rating,
-                "reviews_count": campground.reviews_count
+                "rating": campground["rating"],
+                "reviews_count": campground["reviews_count"]
             },
             "pricing": {
-                "price_low": campground.price_low,
-                "price_high": campground.price_high
+                "price_low": campground["price_low"],
+                "price_high": campground["price_high"]
             },
-            "availability_updated_at": campground.availability_updated_at,
-            "slug": campground.slug
-        }
-        
-        return result
+            "availability_updated_at": campground["availability_updated_at"],
+            "slug": campground["slug"]
+        })
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving detailed campground {campground_id}: {str(e)}")
+        logger.error("Error retrieving detailed campground %s: %s", campground_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/regions")
-def get_available_regions():
+def get_available_regions(request: Request):
     """Return a list of all available regions that can be used with the scraper"""
-    return {
-        "regions": list(BBOX_MAP.keys()),
-        "full_us_available": True
-    }
+    if request.headers.get("if-none-match") == _REGIONS_ETAG:
+        return Response(status_code=304, headers=_REGIONS_HEADERS)
+    return Response(content=_REGIONS_JSON, media_type="application/json", headers=_REGIONS_HEADERS)
 
 @app.post("/scrape-multiregion")
-async def scrape_campgrounds_multiregion(
-    background_tasks: BackgroundTasks,
-    request: Request,
-    max_pages: Optional[int] = None,
-    max_workers: int = 4
-):
+async def scrape_campgrounds_multiregion(body: Optional[MultiRegionBody] = None):
     try:
-        # Parse JSON body to get regions
-        data = await request.json()
-        regions = data.get("regions")
-        
-        # Override query params if provided in body
-        if "max_pages" in data:
-            max_pages = data["max_pages"]
-        if "max_workers" in data:
-            max_workers = data["max_workers"]
+        # FastAPI parses and validates the JSON body once; an empty body uses the defaults
+        body = body or MultiRegionBody()
+        regions = body.regions
+        max_pages = body.max_pages
+        max_workers = body.max_workers
         
         # Validate and prepare regions to scan
         bboxes_to_scan = []
@@ -363,12 +308,13 @@ async def scrape_campgrounds_multiregion(
         # If specific regions are requested
         if regions:
             for region in regions:
-                if region in BBOX_MAP:
-                    bboxes_to_scan.append(BBOX_MAP[region])
+                region_bbox = BBOX_MAP.get(region)
+                if region_bbox is not None:
+                    bboxes_to_scan.append(region_bbox)
                 else:
                     return {
                         "status": "error", 
-                        "message": f"Invalid region '{region}'. Please choose from: {', '.join(BBOX_MAP.keys())}"
+                        "message": f"Invalid region '{region}'. Please choose from: {_REGION_LIST_STR}"
                     }
         else:
             # Default to predefined US regions
@@ -378,8 +324,8 @@ async def scrape_campgrounds_multiregion(
         actual_workers = min(max_workers, len(bboxes_to_scan))
         
         # Start the multiregion scraper in the background
-        background_tasks.add_task(
-            scrape_multiregion_task, 
+        tasks.submit(
+            tasks.scrape_multiregion_task, 
             regions=bboxes_to_scan, 
             max_pages=max_pages, 
             max_workers=actual_workers
@@ -393,5 +339,5 @@ async def scrape_campgrounds_multiregion(
             "max_pages_per_region": max_pages
         }
     except Exception as e:
-        logger.error(f"Error starting multiregion scan: {str(e)}")
+        logger.error("Error starting multiregion scan: %s", e)
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
@@ -1,10 +1,19 @@
+import os
 import uvicorn
 
 if __name__ == "__main__":
+    # Autoreload is opt-in for local development (DEV=1); it runs a single process
+    # with a file watcher. Otherwise one worker runs unless WEB_CONCURRENCY asks for more:
+    # each worker has its own DB pools and its own Nominatim rate limiter, so extra
+    # workers multiply the connections and the geocoding request rate.
+    reload = os.getenv("DEV") == "1"
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    
     # Run the API server
     uvicorn.run(
         "src.api.app:app",
         host="0.0.0.0",
         port=8000,
-        reload=True  
-    ) 
\ No newline at end of file
+        reload=reload,
+        workers=None if reload else workers
+    ) 
@@ -0,0 +1,126 @@
+from sqlalchemy import update
+import concurrent.futures
+import logging
+import os
+import time
+
+from src.db.database import SessionLocal, CampgroundDB
+from src.scraper.dyrt_scraper import US_BOUNDS, FOUR_MAIN_US_REGIONS
+from src.scraper.dyrt_scraper import main as run_scraper, parallel_scrape_regions
+from src.geocoding.nominatim import batch_geocode
+
+logger = logging.getLogger(__name__)
+
+# Long-running scrape/geocode jobs get their own thread pool instead of FastAPI's
+# BackgroundTasks, which share the request threadpool with the API handlers.
+MAX_TASK_WORKERS = int(os.getenv("MAX_TASK_WORKERS", 4))
+
+executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=MAX_TASK_WORKERS,
+    thread_name_prefix="scraper-task"
+)
+
+def submit(task, *args, **kwargs):
+    """
+    Queue a task on the job executor and return immediately.
+    
+    Args:
+        task: One of the task functions below
+        *args, **kwargs: Arguments passed to the task
+        
+    Returns:
+        The concurrent.futures.Future of the queued task
+    """
+    future = executor.submit(task, *args, **kwargs)
+    logger.info("Queued task %s", task.__name__)
+    return future
+
+def shutdown():
+    """Stop accepting new tasks and cancel the ones that haven't started yet."""
+    executor.shutdown(wait=False, cancel_futures=True)
+
+# Background task for scraping
+def scrape_campgrounds_task(bbox= US_BOUNDS, max_pages = None):
+    try:
+        region_name = "Full US" if bbox == US_BOUNDS else f"Region with bbox: {bbox}"
+        page_limit = f"with page limit: {max_pages}" if max_pages is not None else "without page limit (auto-collection)"
+        
+        logger.info("Starting: Scanning %s %s", region_name, page_limit)
+        total_raw, total_processed, inserted, updated = run_scraper(max_pages=max_pages, bbox=bbox)
+        logger.info("Completed: Found %d campgrounds, processed %d, inserted %d, updated %d", total_raw, total_processed, inserted, updated)
+    except Exception as e:
+        logger.error("Error occurred: %s", e)
+
+# Background task for updating addresses
+def update_addresses_task(limit = 100, max_workers = 8):
+    with SessionLocal() as db:
+        try:
+            # Get campgrounds that don't have an address but have coordinates.
+            # Only the columns needed for geocoding are selected, so no ORM objects are loaded.
+            campgrounds = db.query(CampgroundDB).filter(
+                CampgroundDB.address == None,  # No address
+                CampgroundDB.latitude != None,  # Has latitude
+                CampgroundDB.longitude != None  # Has longitude
+            ).with_entities(
+                CampgroundDB.id, CampgroundDB.latitude, CampgroundDB.longitude
+            ).limit(limit).all()
+            
+            logger.info("Found %d campgrounds without address. Starting parallel geocoding with %d workers...", len(campgrounds), max_workers)
+            
+            coords_list = [(latitude, longitude) for _, latitude, longitude in campgrounds]
+            
+            # Process all coordinates in a single batch using parallel geocoding
+            start_time = time.time()
+            addresses = batch_geocode(coords_list, max_workers=max_workers)
+            end_time = time.time()
+            
+            # Build one bulk UPDATE (by primary key) instead of an UPDATE per campground
+            payload = [
+                {"id": campground_id, "address": addresses[coords_list[i]]}
+                for i, (campground_id, _, _) in enumerate(campgrounds)
+                if addresses.get(coords_list[i])
+            ]
+            address_count = len(payload)
+            
+            if payload:
+                db.execute(update(CampgroundDB), payload)
+            db.commit()
+            
+            # Calculate performance stats
+            duration = end_time - start_time
+            processing_speed = len(coords_list) / duration if duration > 0 else 0
+            
+            logger.info("Address update completed: %d addresses added in %.1f seconds", address_count, duration)
+            logger.info("Geocoding performance: %.2f coordinates/second with %d workers", processing_speed, max_workers)
+            
+            return {
+                "success": True, 
+                "addresses_updated": address_count,
+                "processing_time_seconds": duration,
+                "processing_speed": f"{processing_speed:.2f} coordinates/second"
+            }
+            
+        except Exception as e:
+            logger.error("Error updating addresses: %s", e)
+            db.rollback()
+            return {"success": False, "error": str(e)}
+
+# Background task for parallel multi-region scraping
+def scrape_multiregion_task(regions=FOUR_MAIN_US_REGIONS, max_pages=None, max_workers=4):
+    try:
+        logger.info("Starting parallel scan across %d regions with %d workers", len(regions), max_workers)
+        
+        # Call the parallel scraper function
+        total_raw, total_processed, total_inserted, total_updated = parallel_scrape_regions(
+            regions=regions,
+            max_pages=max_pages,
+            max_workers=max_workers
+        )
+        
+        logger.info("Completed multiregion scan: %d found, %d processed, %d inserted, %d updated",
+                    total_raw, total_processed, total_inserted, total_updated)
+        
+        return total_raw, total_processed, total_inserted, total_updated
+    except Exception as e:
+        logger.error("Error in multiregion scan: %s", e)
+        return 0, 0, 0, 0
@@ -1,13 +1,27 @@
-from sqlalchemy import create_engine, Column, String, Float, Boolean, DateTime, ARRAY, Integer 
+from sqlalchemy import create_engine, Column, String, Float, Boolean, DateTime, ARRAY, Integer, Index, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 import os
 import logging
+import threading
 
 # Get logger
 logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DB_URL")
+# Parsed once for both engines; the legacy postgres:// scheme is no longer a SQLAlchemy dialect name
+_DATABASE_URL = make_url(DATABASE_URL)
+if _DATABASE_URL.drivername == "postgres":
+    _DATABASE_URL = _DATABASE_URL.set(drivername="postgresql")
+
+# Every API worker process (WEB_CONCURRENCY, see src/api/server.py) opens its own sync and
+# async pools, so the per-process pool shrinks as workers are added to stay within Postgres'
+# default max_connections=100
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", max(2, 20 // WEB_CONCURRENCY)))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", max(1, 10 // WEB_CONCURRENCY)))
 Base = declarative_base()
 
 # Define the Campground table structure
@@ -36,22 +50,99 @@ class CampgroundDB(Base):
     price_high = Column(Float, nullable=True)
     availability_updated_at = Column(DateTime, nullable=True)
     address = Column(String, nullable=True)  # Added for geocoding reverse lookup
+    content_hash = Column(String(32), nullable=True)  # Fingerprint of the scraped values, see campground_to_row
+
+    __table_args__ = (
+        # Partial index matching the address backfill query, so it doesn't scan the whole table
+        Index(
+            "ix_campgrounds_needs_address",
+            "id",
+            postgresql_where=text("address IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL")
+        ),
+        # Trigram index for the ilike("%region%") filter on /campgrounds (requires pg_trgm)
+        Index(
+            "ix_campgrounds_region_name_trgm",
+            "region_name",
+            postgresql_using="gin",
+            postgresql_ops={"region_name": "gin_trgm_ops"}
+        ),
+    )
+
+# Reverse geocoding results keyed by coordinates rounded to a ~11 m grid,
+# so nearby campgrounds share a single Nominatim lookup
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+    lat_q = Column(Float, primary_key=True)
+    lon_q = Column(Float, primary_key=True)
+    address = Column(String)
+    fetched_at = Column(DateTime)
+
+# Pool sized for the API's concurrent requests plus background scraping/geocoding tasks.
+# psycopg2 batches executemany: bulk INSERTs are sent as multi-row VALUES pages and
+# other statements (e.g. bulk UPDATE by primary key) via execute_batch, 500 parameter sets per round trip.
+engine = create_engine(
+    _DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    executemany_batch_page_size=500
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async engine for the API read endpoints, so requests don't occupy FastAPI's threadpool.
+# The scraper and background tasks keep using the sync engine above. The driver is swapped
+# on the parsed URL, so any postgres:// or postgresql+driver:// DB_URL maps to asyncpg.
+async_engine = create_async_engine(
+    _DATABASE_URL.set(drivername="postgresql+asyncpg"),
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=3600
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+# create_tables() only has to run once per process
+_tables_created = False
+_tables_lock = threading.Lock()
 
 def create_tables():
+    """
+    Create the extension, tables and indexes if they don't exist yet.
+    Safe to call from several entry points and threads; after the first successful
+    call in a process it returns without touching the database.
+    """
+    global _tables_created
+    if _tables_created:
+        return
+    
+    with _tables_lock:
+        if _tables_created:
+            return
+        _create_tables()
+        _tables_created = True
+
+def _create_tables():
     try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         Base.metadata.create_all(bind=engine)
+        # create_all doesn't add columns to an existing table
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE campgrounds ADD COLUMN IF NOT EXISTS content_hash VARCHAR(32)"))
+        # create_all only creates indexes together with new tables, add them to existing ones too
+        for index in CampgroundDB.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
         logger.info("Database tables created (if they didn't exist previously).")
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
 
-def get_db():
-    db = SessionLocal()
-    try:
-        return db
-    except Exception:
-        db.close()
-        raise 
\ No newline at end of file
+async def get_db():
+    """
+    FastAPI dependency that yields an async session and returns its connection to the pool afterwards.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db 
\ No newline at end of file
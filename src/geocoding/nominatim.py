@@ -1,39 +1,291 @@
 import requests
-import time
+import httpx
+import asyncio
+import orjson
 import logging
-import concurrent.futures
-from typing import Optional, Dict, Any, Tuple, List
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from threading import Lock
 
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from urllib3.util.retry import Retry
+
+from src.db.database import SessionLocal, GeocodeCache
+from src.utils.http import create_session
+from src.utils.ratelimit import RateLimiter
+
+# Set NOMINATIM_LOCAL=1 to geocode against a self-hosted Nominatim (NOMINATIM_URL) instead of
+# the public service. The public usage policy allows at most one request per second, which caps
+# geocoding throughput no matter how many workers run; a local instance has no such limit,
+# at the cost of hosting and importing the OSM data for the covered area.
+NOMINATIM_LOCAL = os.getenv("NOMINATIM_LOCAL") == "1"
+
 # Constants
-NOMINATIM_BASE_URL = "https://nominatim.openstreetmap.org/reverse"
+NOMINATIM_BASE_URL = os.getenv(
+    "NOMINATIM_URL",
+    "http://localhost:8080/reverse" if NOMINATIM_LOCAL else "https://nominatim.openstreetmap.org/reverse"
+)
 USER_AGENT = "CampgroundScraperApp/1.0" 
 REQUEST_TIMEOUT = 10  
-RATE_LIMIT_DELAY = 1.1  
+RATE_LIMIT_DELAY = 0 if NOMINATIM_LOCAL else 1.1  
 MAX_RETRIES = 3  
+RETRY_BACKOFF = 1.1  # Base wait between retries, also used with a local instance
+COORDINATE_PRECISION = 4  # Decimal places kept for cache keys (~11 m)
+CACHE_MAX_SIZE = 100_000  # Cached addresses kept before the oldest are evicted
+HTTP_POOL_SIZE = 32 if NOMINATIM_LOCAL else 16  # Pooled connections to Nominatim
 
 # Get logger
 logger = logging.getLogger(__name__)
 
-# Cache to minimize API calls for the same coordinates
-# Format: {(lat, lon): address_string}
-geocoding_cache = {}
+# Bounded cache to minimize API calls for the same coordinates, evicted in insertion order
+# Format: {(lat, lon) rounded to COORDINATE_PRECISION: address_string}
+geocoding_cache = OrderedDict()
 
-# Add lock for thread-safe cache access
+# Serializes cache writes and the pending_requests registry. Reads don't take it: a single
+# dict lookup is atomic under the GIL, and an entry evicted mid-read just counts as a miss.
 cache_lock = Lock()
 
-def get_address_from_coordinates(latitude, longitude):
-    # Check cache first to avoid redundant API calls
-    cache_key = (latitude, longitude)
+# Lookups currently being fetched, so concurrent callers for the same key wait for one request
+# Format: {cache_key: Future resolving to the address}
+pending_requests = {}
+
+# Shared session so sync lookups reuse keep-alive connections to Nominatim.
+# The adapter retries failed requests with exponential backoff and honours Retry-After on 429.
+SESSION = create_session(
+    headers={"User-Agent": USER_AGENT},
+    pool_maxsize=HTTP_POOL_SIZE,
+    max_retries=Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods={"GET"},
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+)
+
+# One request slot per RATE_LIMIT_DELAY for all lookups in the process, sync and async,
+# however many threads or tasks run them. The limit is per process: API worker processes
+# (WEB_CONCURRENCY > 1) each get their own, so public Nominatim needs a single worker.
+rate_limiter = RateLimiter(RATE_LIMIT_DELAY)
+
+def quantize_coordinates(latitude, longitude):
+    """Round a coordinate pair to the cache grid, so nearby points share one cache entry."""
+    return round(latitude, COORDINATE_PRECISION), round(longitude, COORDINATE_PRECISION)
+
+def _cache_get(cache_key):
+    """Return the cached address for a key, or None. Lock-free."""
+    return geocoding_cache.get(cache_key)
+
+def _cache_put(cache_key, address):
+    """Store an address, evicting the oldest entry once the cache is full."""
+    with cache_lock:
+        geocoding_cache[cache_key] = address
+        if len(geocoding_cache) > CACHE_MAX_SIZE:
+            geocoding_cache.popitem(last=False)
+
+def load_persisted_addresses(cache_keys):
+    """
+    Copy addresses stored in the geocode_cache table into the in-memory cache,
+    so results from earlier runs (and from the API) are not requested again.
+    
+    Args:
+        cache_keys: Iterable of quantized (lat, lon) keys
+        
+    Returns:
+        Number of addresses loaded
+    """
+    keys = list(set(cache_keys))
+    if not keys:
+        return 0
+    
+    try:
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(GeocodeCache.lat_q, GeocodeCache.lon_q, GeocodeCache.address).where(
+                    tuple_(GeocodeCache.lat_q, GeocodeCache.lon_q).in_(keys),
+                    GeocodeCache.address.isnot(None)
+                )
+            ).all()
+    except SQLAlchemyError as e:
+        logger.warning("Could not read the persisted geocoding cache: %s", e)
+        return 0
+    
+    for lat_q, lon_q, address in rows:
+        _cache_put((lat_q, lon_q), address)
+    return len(rows)
+
+def persist_addresses(addresses):
+    """
+    Upsert freshly geocoded addresses into the geocode_cache table.
     
+    Args:
+        addresses: Dict mapping quantized (lat, lon) keys to addresses; empty addresses are skipped
+    """
+    fetched_at = datetime.utcnow()
+    rows = [
+        {"lat_q": lat_q, "lon_q": lon_q, "address": address, "fetched_at": fetched_at}
+        for (lat_q, lon_q), address in addresses.items()
+        if address
+    ]
+    if not rows:
+        return
+    
+    stmt = pg_insert(GeocodeCache).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[GeocodeCache.lat_q, GeocodeCache.lon_q],
+        set_={"address": stmt.excluded.address, "fetched_at": stmt.excluded.fetched_at}
+    )
+    try:
+        with SessionLocal() as db:
+            db.execute(stmt)
+            db.commit()
+    except SQLAlchemyError as e:
+        logger.warning("Could not persist %d geocoded addresses: %s", len(rows), e)
+
+def get_address_from_coordinates(latitude, longitude, check_persisted=True):
+    # Check cache first to avoid redundant API calls.
+    # Batch callers that already loaded the persisted cache pass check_persisted=False.
+    cache_key = quantize_coordinates(latitude, longitude)
+    
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Either become the one caller that fetches this key, or wait on the caller already doing it
     with cache_lock:
-        if cache_key in geocoding_cache:
-            return geocoding_cache[cache_key]
+        cached = geocoding_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        future = pending_requests.get(cache_key)
+        is_owner = future is None
+        if is_owner:
+            future = pending_requests[cache_key] = Future()
+    
+    if not is_owner:
+        return future.result()
+    
+    try:
+        # Fall back to the persisted cache before spending a Nominatim request
+        address = None
+        if check_persisted:
+            load_persisted_addresses([cache_key])
+            address = _cache_get(cache_key)
+        if address is None:
+            address = _fetch_address(latitude, longitude, cache_key)
+            if address:
+                persist_addresses({cache_key: address})
+        future.set_result(address)
+        return address
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with cache_lock:
+            del pending_requests[cache_key]
+
+def _fetch_address(latitude, longitude, cache_key):
+    """
+    Call Nominatim for one coordinate pair and cache the result.
+    Retries on connection errors, 429 and 5xx responses are done by the session's adapter.
+    """
+    rate_limiter.wait()
+    
+    params = {
+        "lat": latitude,
+        "lon": longitude,
+        "format": "json",
+        "zoom": 18, 
+        "addressdetails": 1
+    }
+    
+    try:
+        response = SESSION.get(
+            NOMINATIM_BASE_URL,
+            params=params,
+            timeout=REQUEST_TIMEOUT
+        )
+        
+        if response.status_code != 200:
+            logger.error("Geocoding HTTP error (%s) for coordinates (%s, %s)", response.status_code, latitude, longitude)
+            return None
+        
+        # Extract the formatted address; orjson decodes the raw bytes without building a str first
+        address = orjson.loads(response.content).get("display_name")
+        if address:
+            # Cache the result
+            _cache_put(cache_key, address)
+            logger.debug("Successfully geocoded coordinates (%s, %s)", latitude, longitude)
+            return address
+        
+        logger.warning("No address found for coordinates (%s, %s)", latitude, longitude)
+        return None
+    
+    except requests.RequestException as e:
+        logger.error("Failed to geocode coordinates (%s, %s) after %s retries: %s", latitude, longitude, MAX_RETRIES, e)
+        return None
+    except Exception as e:
+        logger.error("Unexpected error during geocoding: %s", e)
+        return None
+
+def reverse_geocode_many(coordinates_list, max_workers=4):
+    """
+    Resolve the addresses of a batch of coordinates, e.g. one page of campgrounds.
+    Nominatim has no bulk reverse endpoint, so the batch saving comes from reading every
+    persisted address in one query and only requesting the misses, concurrently.
+    
+    Args:
+        coordinates_list: List of (latitude, longitude) tuples
+        max_workers: Threads used for the lookups that go to Nominatim
+        
+    Returns:
+        List of addresses (or None) in the same order as coordinates_list
+    """
+    cache_keys = [quantize_coordinates(lat, lon) for lat, lon in coordinates_list]
+    missing = {key for key in cache_keys if _cache_get(key) is None}
+    if missing:
+        load_persisted_addresses(missing)
+    
+    def lookup(coords):
+        try:
+            # The persisted cache was read for the whole batch above
+            return get_address_from_coordinates(*coords, check_persisted=False)
+        except Exception as e:
+            logger.error("Error geocoding coordinates %s: %s", coords, e, exc_info=True)
+            return None
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lookup, coordinates_list))
+
+async def get_address_from_coordinates_async(latitude, longitude, client):
+    """
+    Async variant of get_address_from_coordinates for use inside the API event loop.
+    Shares the module cache and retry policy, and reuses the caller's httpx.AsyncClient
+    so connections to Nominatim are kept alive between requests. Requests are paced by
+    the module-wide rate_limiter rather than a fixed sleep per call.
+    
+    Args:
+        latitude: Latitude of the point
+        longitude: Longitude of the point
+        client: Shared httpx.AsyncClient
+        
+    Returns:
+        The formatted address, or None if it could not be determined
+    """
+    cache_key = quantize_coordinates(latitude, longitude)
+    
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
     
     retries = 0
     while retries < MAX_RETRIES:
         try:
-            time.sleep(RATE_LIMIT_DELAY)
+            await rate_limiter.wait_async()
             
             params = {
                 "lat": latitude,
@@ -47,7 +299,7 @@ def get_address_from_coordinates(latitude, longitude):
                 "User-Agent": USER_AGENT
             }
             
-            response = requests.get(
+            response = await client.get(
                 NOMINATIM_BASE_URL,
                 params=params,
                 headers=headers,
@@ -55,80 +307,119 @@ def get_address_from_coordinates(latitude, longitude):
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 
-                # Extract the formatted address
                 if "display_name" in data:
                     address = data["display_name"]
-                    # Cache the result
-                    with cache_lock:
-                        geocoding_cache[cache_key] = address
-                    logger.info(f"Successfully geocoded coordinates ({latitude}, {longitude})")
+                    _cache_put(cache_key, address)
+                    logger.debug("Successfully geocoded coordinates (%s, %s)", latitude, longitude)
                     return address
             
             retries += 1
-            wait_time = RATE_LIMIT_DELAY * (retries + 1)
+            wait_time = RETRY_BACKOFF * (retries + 1)
             
             if response.status_code != 200:
-                logger.warning(f"Geocoding HTTP error ({response.status_code}) for coordinates ({latitude}, {longitude}). Retrying in {wait_time}s... (Attempt {retries}/{MAX_RETRIES})")
-                time.sleep(wait_time)
+                logger.warning("Geocoding HTTP error (%s) for coordinates (%s, %s). Retrying in %ss... (Attempt %s/%s)", response.status_code, latitude, longitude, wait_time, retries, MAX_RETRIES)
+                await asyncio.sleep(wait_time)
                 continue
                 
-            logger.warning(f"No address found for coordinates ({latitude}, {longitude})")
+            logger.warning("No address found for coordinates (%s, %s)", latitude, longitude)
             return None
                 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             retries += 1
-            wait_time = RATE_LIMIT_DELAY * (retries + 1)
-            logger.warning(f"Network error for coordinates ({latitude}, {longitude}): {e}. Retrying in {wait_time}s... (Attempt {retries}/{MAX_RETRIES})")
-            time.sleep(wait_time)
+            wait_time = RETRY_BACKOFF * (retries + 1)
+            logger.warning("Network error for coordinates (%s, %s): %s. Retrying in %ss... (Attempt %s/%s)", latitude, longitude, e, wait_time, retries, MAX_RETRIES)
+            await asyncio.sleep(wait_time)
         except Exception as e:
-            logger.error(f"Unexpected error during geocoding: {e}")
+            logger.error("Unexpected error during geocoding: %s", e)
             return None
     
-    logger.error(f"Failed to geocode coordinates ({latitude}, {longitude}) after {MAX_RETRIES} attempts")
+    logger.error("Failed to geocode coordinates (%s, %s) after %s attempts", latitude, longitude, MAX_RETRIES)
     return None
 
-def batch_geocode(coordinates_list, max_workers=4):
+async def batch_geocode_async(coordinates_list, max_workers=4, client=None):
+    """
+    Geocode many coordinate pairs concurrently on one event loop.
+    
+    Args:
+        coordinates_list: List of (latitude, longitude) tuples
+        max_workers: Maximum number of geocoding requests in flight at once
+        client: Optional shared httpx.AsyncClient; a client is created for the batch if omitted
+        
+    Returns:
+        Dict mapping each (latitude, longitude) tuple to its address (or None)
+    """
+    total_coords = len(coordinates_list)
+    logger.info("Starting parallel batch geocoding for %d coordinate pairs with %d workers", total_coords, max_workers)
+    
+    # Load what earlier runs already stored, and remember which keys still need a request
+    cache_keys = [quantize_coordinates(lat, lon) for lat, lon in coordinates_list]
+    await asyncio.to_thread(load_persisted_addresses, cache_keys)
+    missing_keys = {key for key in cache_keys if _cache_get(key) is None}
+    
+    # The semaphore bounds requests in flight; the shared rate limiter keeps the overall
+    # request rate within the Nominatim usage policy
+    semaphore = asyncio.Semaphore(max_workers)
+    completed = 0
+    
+    async def geocode_bounded(http_client, lat, lon):
+        nonlocal completed
+        async with semaphore:
+            address = await get_address_from_coordinates_async(lat, lon, http_client)
+        
+        # Log progress every 10 coordinates or at the end
+        completed += 1
+        if completed % 10 == 0 or completed == total_coords:
+            logger.info("Geocoding progress: %d/%d (%.1f%%)", completed, total_coords, completed / total_coords * 100)
+        return address
+    
+    async def run(http_client):
+        return await asyncio.gather(
+            *[geocode_bounded(http_client, lat, lon) for lat, lon in coordinates_list],
+            return_exceptions=True
+        )
+    
+    if client is None:
+        # HTTP/2 lets concurrent lookups multiplex over a single connection
+        async with httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=max_workers)
+        ) as own_client:
+            addresses = await run(own_client)
+    else:
+        addresses = await run(client)
+    
     results = {}
     success_count = 0
     failure_count = 0
     
-    total_coords = len(coordinates_list)
-    logger.info(f"Starting parallel batch geocoding for {total_coords} coordinate pairs with {max_workers} workers")
-    
-    # Use ThreadPoolExecutor to geocode in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Create a future for each coordinate pair
-        future_to_coords = {
-            executor.submit(get_address_from_coordinates, lat, lon): (lat, lon)
-            for lat, lon in coordinates_list
-        }
+    for coords, address in zip(coordinates_list, addresses):
+        if isinstance(address, Exception):
+            logger.error("Error geocoding coordinates %s: %s", coords, str(address))
+            address = None
+        results[coords] = address
         
-        # Process results as they complete
-        for i, future in enumerate(concurrent.futures.as_completed(future_to_coords)):
-            coords = future_to_coords[future]
-            try:
-                address = future.result()
-                results[coords] = address
-                
-                if address:
-                    success_count += 1
-                else:
-                    failure_count += 1
-                    
-                # Log progress every 10 coordinates or at the end
-                if (i + 1) % 10 == 0 or (i + 1) == total_coords:
-                    logger.info(f"Geocoding progress: {i+1}/{total_coords} ({((i+1)/total_coords*100):.1f}%)")
-            except Exception as e:
-                failure_count += 1
-                logger.error(f"Error geocoding coordinates {coords}: {str(e)}")
-                results[coords] = None
+        if address:
+            success_count += 1
+        else:
+            failure_count += 1
+    
+    # Store the newly geocoded addresses for later runs
+    await asyncio.to_thread(persist_addresses, {
+        key: results[coords] for key, coords in zip(cache_keys, coordinates_list) if key in missing_keys
+    })
     
     # Log summary
     total = success_count + failure_count
     if total > 0:
         success_rate = (success_count / total) * 100
-        logger.info(f"Parallel batch geocoding completed: {success_rate:.1f}% success rate ({success_count}/{total})")
+        logger.info("Parallel batch geocoding completed: %.1f%% success rate (%d/%d)", success_rate, success_count, total)
     
-    return results 
\ No newline at end of file
+    return results
+
+def batch_geocode(coordinates_list, max_workers=4):
+    """
+    Synchronous entry point for batch_geocode_async, for callers running outside an event loop.
+    """
+    return asyncio.run(batch_geocode_async(coordinates_list, max_workers=max_workers))
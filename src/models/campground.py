@@ -1,13 +1,17 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_serializer
 
 
 class CampgroundLinks(BaseModel):
 
     self: HttpUrl
 
+    @field_serializer("self")
+    def serialize_self(self, url: HttpUrl) -> str:
+        return str(url)
+
 
 class Campground(BaseModel):
     """
@@ -39,3 +43,26 @@ class Campground(BaseModel):
     )
     address: Optional[str] = None  # Added for geocoding reverse lookup
     # address: Optinal[str] = "" For bonus point
+
+    # URLs are dumped as plain strings, ready to be stored in String/ARRAY(String) columns
+    @field_serializer("photo_url")
+    def serialize_photo_url(self, url: Optional[HttpUrl]) -> Optional[str]:
+        return str(url) if url else None
+
+    @field_serializer("photo_urls")
+    def serialize_photo_urls(self, urls: List[HttpUrl]) -> List[str]:
+        return [str(url) for url in urls]
+
+
+class CampgroundSummary(BaseModel):
+    """
+    Response model for campground list endpoints, built from DB rows.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    name: Optional[str] = None
+    region_name: Optional[str] = None
+    rating: Optional[float] = None
+    price_low: Optional[float] = None
+    price_high: Optional[float] = None
@@ -1,36 +1,85 @@
 import requests
-from pydantic import ValidationError
-from src.models.campground import Campground
+import httpx
+import asyncio
+import orjson
+from pydantic import TypeAdapter, ValidationError
+from typing import List
+from src.models.campground import Campground, CampgroundLinks
 from src.db.database import SessionLocal, CampgroundDB, create_tables
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
+from urllib3.util.retry import Retry
 import time
 import logging
+import hashlib
+import math
 import os
+import queue
+import threading
+import collections
 import concurrent.futures
-from datetime import datetime
-from src.geocoding.nominatim import get_address_from_coordinates
-
-# Create logs directory
-logs_dir = os.path.join(os.getcwd(), 'logs')
-os.makedirs(logs_dir, exist_ok=True)
-
-# Create log file with today's date
-log_filename = os.path.join(logs_dir, f'scraper_{datetime.now().strftime("%Y%m%d")}.log')
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_filename),
-        logging.StreamHandler() 
-    ]
-)
+from types import MappingProxyType
+from urllib.parse import urlencode
+from src.geocoding.nominatim import reverse_geocode_many
+from src.utils.logging_config import setup_logging
+from src.utils.http import create_session, retry_after_seconds
+from src.utils.ratelimit import RateLimiter
+from src.utils.page_cache import ValidatorCache, conditional_headers
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://thedyrt.com/api/v6/locations/search-results"
 
+# Minimum seconds between page requests for one region. No fixed pacing by default: requests
+# only slow down when the API answers 429, through api_throttle below.
+PAGE_REQUEST_INTERVAL = float(os.getenv("PAGE_REQUEST_INTERVAL", 0))
+
+# Campgrounds requested per page
+PAGE_SIZE = 20
+
+# Concurrent page requests per region once the page count is known
+PAGE_FETCH_WORKERS = 4
+
+# Fetched pages buffered ahead of processing in scrape_region
+PAGE_QUEUE_SIZE = 2
+
+# Processed chunks waiting for the database writer; processing pauses once this many are queued
+SAVE_QUEUE_SIZE = 1
+
+# Values used for required text attributes missing from an API record
+_ATTRIBUTE_DEFAULTS = {"name": "", "region-name": ""}
+
+# List attributes the API may send as null; validation would reject them, so FAST_PARSE
+# (which skips validation) replaces them with empty lists before building the model
+_LIST_ATTRIBUTES = ("accommodation-type-names", "camper-types", "photo-urls")
+
+# Keys (by alias) of the model's required fields; FAST_PARSE validates records missing any of them
+_REQUIRED_KEYS = tuple(
+    field.alias or name for name, field in Campground.model_fields.items() if field.is_required()
+)
+
+# Validates a whole page of campground dicts in one pydantic-core call
+CAMPGROUND_LIST_ADAPTER = TypeAdapter(List[Campground])
+
+# The API already returns administrative-area and nearest-city-name for most campgrounds, so only
+# the others are reverse geocoded. Set GEOCODE_ALL=1 to look up an address for every campground.
+GEOCODE_ALL = os.getenv("GEOCODE_ALL") == "1"
+
+# Threads geocoding the uncached campgrounds of one page; the shared Nominatim rate limiter keeps them polite
+GEOCODE_WORKERS = 4
+
+# Set FAST_PARSE=1 to build Campground models without validation (model_construct) when the API
+# schema is known to be stable. Values are then stored as the API sent them and malformed records
+# are not rejected, so full validation stays the default.
+FAST_PARSE = os.getenv("FAST_PARSE") == "1"
+
+# Processed campgrounds collected by scrape_region before they are written to the database
+SAVE_CHUNK_SIZE = 500
+
+# Number of rows sent per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 1000
+
 DEFAULT_HEADERS = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
         "Accept": "application/json",
@@ -39,43 +88,83 @@ DEFAULT_HEADERS = {
         "Origin": "https://thedyrt.com"
     }
 
+# (connect, read) timeouts in seconds for API requests, so a stalled connection can't hang a scan
+REQUEST_TIMEOUT = (5, 30)
+
+# Pooled connections to the API, enough for the PAGE_FETCH_WORKERS fetcher threads of a few
+# concurrent scrape_region runs (e.g. background tasks); multi-region scans use the async client
+HTTP_POOL_SIZE = 16
+
+# Process-wide back-off for the API: paused for the Retry-After delay of a 429 response,
+# so every region and fetcher holds off together instead of retrying into the limit
+api_throttle = RateLimiter(0)
+
+# Retries of a failed page request, and the base of their exponential backoff in seconds
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.5
+
+# Shared session so consecutive page requests reuse the same keep-alive connection.
+# The adapter retries connection errors, 429 and 5xx with exponential backoff and honours Retry-After.
+SESSION = create_session(
+    headers=DEFAULT_HEADERS,
+    pool_maxsize=HTTP_POOL_SIZE,
+    max_retries=Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods={"GET"},
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+)
+
+# Set PAGE_CACHE_FILE to a file path to remember the ETag / Last-Modified of every fetched page and
+# request it conditionally on later runs; pages answered with 304 are not processed or saved again.
+# Delete the file to force a full refresh.
+PAGE_CACHE_FILE = os.getenv("PAGE_CACHE_FILE")
+
+page_cache = ValidatorCache(PAGE_CACHE_FILE)
+
+# Bounding boxes are (min_lon, min_lat, max_lon, max_lat) tuples of floats, formatted for the
+# API only when a request is built, so they can be compared and split without parsing.
+
 # The US bounding box coordinates (Full country)
-US_BOUNDS = "-125.0, 24.0, -66.0, 49.5"
+US_BOUNDS = (-125.0, 24.0, -66.0, 49.5)
 
 # Regional US bbox definitions for more precise scraping
 # Western US (Rocky Mountains region)
-WESTERN_US_BOUNDS = "-125.0, 32.0, -105.0, 49.0"
+WESTERN_US_BOUNDS = (-125.0, 32.0, -105.0, 49.0)
 
 # Eastern US
-EASTERN_US_BOUNDS = "-90.0, 24.0, -66.0, 49.5"
+EASTERN_US_BOUNDS = (-90.0, 24.0, -66.0, 49.5)
 
 # Midwest US
-MIDWEST_US_BOUNDS = "-104.0, 36.5, -80.0, 49.0"
+MIDWEST_US_BOUNDS = (-104.0, 36.5, -80.0, 49.0)
 
 # Southern US
-SOUTHERN_US_BOUNDS = "-106.0, 25.0, -75.0, 36.5"
+SOUTHERN_US_BOUNDS = (-106.0, 25.0, -75.0, 36.5)
 
 # Pacific Northwest
-PACIFIC_NW_BOUNDS = "-125.0, 42.0, -116.5, 49.0"
+PACIFIC_NW_BOUNDS = (-125.0, 42.0, -116.5, 49.0)
 
 # Southwest US
-SOUTHWEST_US_BOUNDS = "-120.0, 31.0, -105.0, 42.0"
+SOUTHWEST_US_BOUNDS = (-120.0, 31.0, -105.0, 42.0)
 
 # Northeast US
-NORTHEAST_US_BOUNDS = "-80.0, 40.0, -66.0, 49.0"
+NORTHEAST_US_BOUNDS = (-80.0, 40.0, -66.0, 49.0)
 
 # Southeast US
-SOUTHEAST_US_BOUNDS = "-90.0, 24.0, -75.0, 36.5"
+SOUTHEAST_US_BOUNDS = (-90.0, 24.0, -75.0, 36.5)
 
 # State-specific bounding boxes
 # New York area
-# NY_BOUNDS = "-80.0, 40.0, -71.0, 45.0"
+# NY_BOUNDS = (-80.0, 40.0, -71.0, 45.0)
 
 # California area
-# CA_BOUNDS = "-124.0, 32.0, -114.0, 42.0"
+# CA_BOUNDS = (-124.0, 32.0, -114.0, 42.0)
 
 # Test area (small portion of Yellowstone)
-# TEST_BOUNDS = "-111.0, 44.0, -110.0, 45.0"
+# TEST_BOUNDS = (-111.0, 44.0, -110.0, 45.0)
 
 # Define 4 main US regions for parallel scraping
 FOUR_MAIN_US_REGIONS = [
@@ -85,387 +174,871 @@ FOUR_MAIN_US_REGIONS = [
     SOUTHERN_US_BOUNDS # Southern US
 ]
 
+# Named regions that can be selected from the CLI (main.py) and the API
+REGION_BOUNDS = MappingProxyType({
+    "us": US_BOUNDS,
+    "western_us": WESTERN_US_BOUNDS,
+    "eastern_us": EASTERN_US_BOUNDS,
+    "midwest_us": MIDWEST_US_BOUNDS,
+    "southern_us": SOUTHERN_US_BOUNDS,
+    "pacific_northwest": PACIFIC_NW_BOUNDS,
+    "southwest_us": SOUTHWEST_US_BOUNDS,
+    "northeast_us": NORTHEAST_US_BOUNDS,
+    "southeast_us": SOUTHEAST_US_BOUNDS
+})
+
+def format_bbox(bbox):
+    """
+    Format a bounding box for the filter[search][bbox] parameter.
+    Strings (e.g. a custom bbox passed to the API) are sent unchanged.
+    """
+    if isinstance(bbox, str):
+        return bbox
+    return ", ".join(map(str, bbox))
+
+# Search filters that are the same for every request, encoded into a query string once
+_STATIC_QUERY = urlencode((
+    ("filter[search][drive_time]", "any"),
+    ("filter[search][air_quality]", "any"),
+    ("filter[search][electric_amperage]", "any"),
+    ("filter[search][max_vehicle_length]", "any"),
+    ("filter[search][price]", "any"),
+    ("filter[search][rating]", "any"),
+    ("sort", "recommended"),
+))
+
+def build_search_url(bbox, page, page_size):
+    """
+    Full URL of one page of the search-results endpoint, usable by both requests and httpx.
+    Only the varying parameters are encoded per call.
+    """
+    return f"{BASE_URL}?{_STATIC_QUERY}&" + urlencode((
+        ("filter[search][bbox]", format_bbox(bbox)),
+        ("page[number]", page),
+        ("page[size]", page_size),
+    ))
+
+def page_cache_key(bbox, page, page_size):
+    """Key of one search page in page_cache."""
+    return f"{format_bbox(bbox)}|{page_size}|{page}"
+
+def get_search_page(bbox, page=1, page_size=5):
+    """
+    Fetch one page of search results and return the whole parsed response body
+    (the "data" list plus JSON:API "meta"), or an empty dict if the request failed.
+    If the page is unchanged since it was cached (HTTP 304), "data" is None and "meta"
+    is the cached one. Retries on connection errors, 429 and 5xx are done by the session's adapter.
+    """
+    url = build_search_url(bbox, page, page_size)
+    cache_key = page_cache_key(bbox, page, page_size)
+    cached = page_cache.get(cache_key)
+    headers = conditional_headers(cached)
+    
+    try:
+        api_throttle.wait()
+        logger.debug("API request: page %s, region %s", page, bbox)
+        response = SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        
+        if response.status_code == 304:
+            logger.debug("Page %s unchanged since the last run, region %s", page, bbox)
+            return {"data": None, "meta": cached["meta"]}
+        
+        if response.status_code == 200:
+            # orjson parses the (already decompressed) body faster than response.json()
+            body = orjson.loads(response.content)
+            page_cache.stage(cache_key, response.headers, body.get("meta", {}))
+            logger.debug("Retrieved %d campgrounds", len(body.get('data', [])))
+            return body
+        
+        if response.status_code == 429:
+            # The adapter's retries are used up; hold back the other fetchers as long as the API asks
+            api_throttle.pause(retry_after_seconds(response.headers, RETRY_BACKOFF))
+        logger.error("Failed to fetch page %s: HTTP %s - %s", page, response.status_code, response.text)
+        return {}
+    
+    except requests.exceptions.RequestException as e:
+        logger.error("Failed to fetch campgrounds after %d retries: %s", MAX_RETRIES, e)
+        return {}
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return {}
+
 def get_campgrounds(bbox, page=1, page_size=5):
-    params = {
-        "filter[search][drive_time]": "any",
-        "filter[search][air_quality]": "any",
-        "filter[search][electric_amperage]": "any",
-        "filter[search][max_vehicle_length]": "any",
-        "filter[search][price]": "any",
-        "filter[search][rating]": "any",
-        "filter[search][bbox]": bbox,
-        "sort": "recommended",
-        "page[number]": page,
-        "page[size]": page_size
-    }
+    """
+    Fetch one page of search results and return its list of campground records,
+    or None if the page is unchanged since the last run.
+    """
+    return get_search_page(bbox, page, page_size).get("data", [])
+
+def get_page_count(meta, page_size):
+    """
+    Number of result pages announced in a response's JSON:API meta block, or None if it has none.
+    """
+    if "page-count" in meta:
+        return int(meta["page-count"])
+    total = meta.get("record-count", meta.get("total-count"))
+    if total is None:
+        return None
+    return math.ceil(int(total) / page_size)
+
+async def get_search_page_async(client, bbox, page=1, page_size=5):
+    """
+    Async variant of get_search_page using a shared httpx.AsyncClient.
+    Follows the same retry policy: back off on 429/5xx and connection errors, give up on other 4xx.
+    """
+    url = build_search_url(bbox, page, page_size)
+    cache_key = page_cache_key(bbox, page, page_size)
+    cached = page_cache.get(cache_key)
+    headers = conditional_headers(cached)
 
     max_retries = 3
     retries = 0
     
     while retries < max_retries:
         try:
-            logger.info(f"API request: page {page}, region {bbox}")
-            response = requests.get(BASE_URL, headers=DEFAULT_HEADERS, params=params)
+            await api_throttle.wait_async()
+            logger.debug("API request: page %s, region %s", page, bbox)
+            response = await client.get(url, headers=headers)
+            
+            if response.status_code == 304:
+                logger.debug("Page %s unchanged since the last run, region %s", page, bbox)
+                return {"data": None, "meta": cached["meta"]}
             
             if response.status_code == 200:
-                data = response.json().get("data", [])
-                logger.info(f"Retrieved {len(data)} campgrounds")
-                return data
+                body = orjson.loads(response.content)
+                page_cache.stage(cache_key, response.headers, body.get("meta", {}))
+                logger.debug("Retrieved %d campgrounds", len(body.get('data', [])))
+                return body
             
             retries += 1
             wait_time = 2 * retries 
             
             if 400 <= response.status_code < 500:
                 if response.status_code == 429:  # Rate limiting
-                    logger.warning(f"Rate limit exceeded. Waiting {wait_time} seconds... (Attempt {retries}/{max_retries})")
+                    wait_time = retry_after_seconds(response.headers, wait_time)
+                    logger.warning("Rate limit exceeded. Waiting %s seconds... (Attempt %s/%s)", wait_time, retries, max_retries)
+                    api_throttle.pause(wait_time)
+                    continue
                 else:
-                    logger.error(f"Client error: HTTP {response.status_code} - {response.text}")
-                    return []  
+                    logger.error("Client error: HTTP %s - %s", response.status_code, response.text)
+                    return {}  
             elif 500 <= response.status_code < 600:
-                logger.warning(f"Server error: HTTP {response.status_code}. Retrying in {wait_time} seconds... (Attempt {retries}/{max_retries})")
+                logger.warning("Server error: HTTP %s. Retrying in %s seconds... (Attempt %s/%s)", response.status_code, wait_time, retries, max_retries)
             
-            time.sleep(wait_time)
+            await asyncio.sleep(wait_time)
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             retries += 1
             wait_time = 2 * retries
-            logger.warning(f"Connection error: {e}. Retrying in {wait_time} seconds... (Attempt {retries}/{MAX_retries})")
-            time.sleep(wait_time)
+            logger.warning("Connection error: %s. Retrying in %s seconds... (Attempt %s/%s)", e, wait_time, retries, max_retries)
+            await asyncio.sleep(wait_time)
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            return []
+            logger.error("Unexpected error: %s", e)
+            return {}
     
-    logger.error(f"Failed to fetch campgrounds after {max_retries} attempts.")
-    return []
+    logger.error("Failed to fetch campgrounds after %d attempts.", max_retries)
+    return {}
 
-def process_campground(campground_data):
-    try:
-        # Extract the attributes from the API response
-        attrs = campground_data.get("attributes", {})
-        logger.debug(f"Processing campground {campground_data.get('id')}: {attrs.get('name', 'unnamed')}")
-        
-        # Get latitude and longitude
-        latitude = attrs.get("latitude")
-        longitude = attrs.get("longitude")
-        
-        # Get address using reverse geocoding
-        address = None
-        if latitude is not None and longitude is not None:
-            address = get_address_from_coordinates(latitude, longitude)
-            if address:
-                logger.debug(f"Found address: {address}")
-            else:
-                logger.debug(f"Could not determine address for coordinates ({latitude}, {longitude})")
-        
-        # Create the data structure expected by the Pydantic model
-        campground_dict = {
-            "id": campground_data.get("id"),
-            "type": campground_data.get("type"),
-            "links": {
-                "self": campground_data.get("links", {}).get("self", "https://thedyrt.com")
-            },
-            "name": attrs.get("name", ""),
-            "latitude": latitude,
-            "longitude": longitude,
-            "region-name": attrs.get("region-name", ""),
-            "administrative-area": attrs.get("administrative-area"),
-            "nearest-city-name": attrs.get("nearest-city-name"),
-            "accommodation-type-names": attrs.get("accommodation-type-names", []),
-            "bookable": attrs.get("bookable", False),
-            "camper-types": attrs.get("camper-types", []),
-            "operator": attrs.get("operator"),
-            "photo-url": attrs.get("photo-url"),
-            "photo-urls": attrs.get("photo-urls", []),
-            "photos-count": attrs.get("photos-count", 0),
-            "rating": attrs.get("rating"),
-            "reviews-count": attrs.get("reviews-count", 0),
-            "slug": attrs.get("slug"),
-            "price-low": attrs.get("price-low"),
-            "price-high": attrs.get("price-high"),
-            "availability-updated-at": attrs.get("availability-updated-at"),
-            "address": address
+async def get_campgrounds_async(client, bbox, page=1, page_size=5):
+    """
+    Async variant of get_campgrounds: one page of search results as a list of campground records.
+    """
+    return (await get_search_page_async(client, bbox, page, page_size)).get("data", [])
+
+def build_campground_dict(campground_data):
+    """
+    Shape one raw API record for Campground validation.
+    The model's field aliases match the API's attribute names, so the attributes are passed
+    through as-is (unknown keys are ignored by the model) on top of the defaults for the
+    required text fields; only the top-level id, type and link are added.
+    """
+    attrs = campground_data.get("attributes", {})
+    logger.debug("Processing campground %s: %s", campground_data.get("id"), attrs.get("name", "unnamed"))
+    
+    return {
+        **_ATTRIBUTE_DEFAULTS,
+        **attrs,
+        "id": campground_data.get("id"),
+        "type": campground_data.get("type"),
+        "links": {
+            "self": campground_data.get("links", {}).get("self", "https://thedyrt.com")
         }
-        
-        # Create and validate a Campground model instance
-        campground = Campground(**campground_dict)
-        return campground
-        
+    }
+
+def construct_campground(campground_data):
+    """
+    Build a Campground model from a raw record without validating it (FAST_PARSE).
+    Records missing a required value are validated instead, so they are rejected (None)
+    rather than built half-filled.
+    """
+    campground_dict = build_campground_dict(campground_data)
+    if any(campground_dict.get(key) is None for key in _REQUIRED_KEYS):
+        return validate_campground(campground_data)
+    for key in _LIST_ATTRIBUTES:
+        if campground_dict.get(key) is None:
+            campground_dict[key] = []
+    campground_dict["links"] = CampgroundLinks.model_construct(**campground_dict["links"])
+    return Campground.model_construct(**campground_dict)
+
+def validate_campground(campground_data):
+    """
+    Validate a single raw record into a Campground model, or return None if it is invalid.
+    """
+    try:
+        return Campground.model_validate(build_campground_dict(campground_data))
     except ValidationError as e:
         # Log specific validation errors
-        logger.error(f"Validation error for campground {campground_data.get('id')}: {e.errors()}")
+        logger.error("Validation error for campground %s: %s", campground_data.get('id'), e.errors())
         return None
     except Exception as e:
         # Log other unexpected errors
-        logger.error(f"Unexpected error while processing campground {campground_data.get('id')}: {e}")
+        logger.error("Unexpected error while processing campground %s: %s", campground_data.get('id'), e)
         return None
 
+def add_addresses(campgrounds):
+    """
+    Fill in the addresses of a page of validated campgrounds with one batched geocoding call.
+    Campgrounds the API already located (administrative area and nearest city) are skipped
+    unless GEOCODE_ALL is set.
+    """
+    # Records without coordinates can't be geocoded
+    campgrounds = [
+        campground for campground in campgrounds
+        if campground.latitude is not None and campground.longitude is not None
+    ]
+    if not GEOCODE_ALL:
+        campgrounds = [
+            campground for campground in campgrounds
+            if not (campground.administrative_area and campground.nearest_city_name)
+        ]
+    if not campgrounds:
+        return
+    
+    addresses = reverse_geocode_many(
+        [(campground.latitude, campground.longitude) for campground in campgrounds],
+        max_workers=GEOCODE_WORKERS
+    )
+    for campground, address in zip(campgrounds, addresses):
+        if not address:
+            logger.debug("Could not determine address for coordinates (%s, %s)", campground.latitude, campground.longitude)
+        campground.address = address
+
+def campground_to_row(campground):
+    """
+    Convert a validated Campground model into a dict of CampgroundDB column values.
+    Field names already match the column names and the model dumps URLs as strings,
+    so only the nested link needs flattening. content_hash fingerprints the other values,
+    so saving an unchanged campground again can skip the UPDATE.
+    """
+    # Unvalidated (FAST_PARSE) models may hold raw strings, e.g. for datetimes; don't warn about them
+    row = campground.model_dump(warnings=not FAST_PARSE)
+    row["links_self"] = row.pop("links")["self"]
+    row["content_hash"] = hashlib.blake2b(
+        orjson.dumps(row, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+    return row
+
+# Columns overwritten when an incoming campground already exists (everything but the key)
+UPDATABLE_COLUMNS = tuple(column.name for column in CampgroundDB.__table__.columns if column.name != "id")
+
+def build_upsert_statement(rows):
+    """
+    Build a single INSERT ... ON CONFLICT (id) DO UPDATE for a batch of rows.
+    RETURNING (xmax = 0) is true for freshly inserted rows and false for updated ones;
+    existing rows with the same content_hash are left untouched and not returned.
+    A stored address is kept when the incoming row wasn't geocoded.
+    """
+    stmt = pg_insert(CampgroundDB).values(rows)
+    set_ = {column: stmt.excluded[column] for column in UPDATABLE_COLUMNS}
+    set_["address"] = func.coalesce(stmt.excluded.address, CampgroundDB.address)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CampgroundDB.id],
+        set_=set_,
+        where=CampgroundDB.content_hash.is_distinct_from(stmt.excluded.content_hash)
+    )
+    return stmt.returning(literal_column("xmax = 0"))
+
 def save_to_database(campgrounds):
-    logger.info(f"Saving {len(campgrounds)} campgrounds to database")
+    logger.info("Saving %d campgrounds to database", len(campgrounds))
+    
+    # ON CONFLICT can't touch the same row twice in one statement, so keep the last copy of each id.
+    # Sorting by id gives concurrent region scans the same lock order on overlapping rows.
+    unique_campgrounds = {campground.id: campground for campground in campgrounds}
+    rows = [campground_to_row(unique_campgrounds[key]) for key in sorted(unique_campgrounds)]
     
-    db = SessionLocal()
     inserted_count = 0
     updated_count = 0
     error_count = 0
     
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[start:start + UPSERT_BATCH_SIZE]
+        
+        # Simple retry mechanism for each batch upsert
+        max_db_retries = 3
+        db_retries = 0
+        success = False
+        
+        while not success and db_retries < max_db_retries:
+            try:
+                # One transaction per batch: committed on exit, rolled back if the upsert fails
+                with SessionLocal.begin() as db:
+                    inserted_flags = db.execute(build_upsert_statement(batch)).scalars().all()
+                success = True
+                
+                # Unchanged rows are skipped by the upsert and don't appear in RETURNING
+                batch_inserted = sum(1 for inserted in inserted_flags if inserted)
+                batch_updated = len(inserted_flags) - batch_inserted
+                inserted_count += batch_inserted
+                updated_count += batch_updated
+                logger.debug("Upserted batch of %d campgrounds: %d inserted, %d updated, %d unchanged",
+                             len(batch), batch_inserted, batch_updated, len(batch) - len(inserted_flags))
+                
+            except SQLAlchemyError as e:
+                db_retries += 1
+                wait_time = 0.5 * db_retries
+                
+                if db_retries >= max_db_retries:
+                    logger.error("Database error for batch of %d campgrounds after %d attempts: %s", len(batch), max_db_retries, e)
+                    error_count += len(batch)
+                else:
+                    logger.warning("Database error for batch of %d campgrounds, retrying... (Attempt %d/%d)", len(batch), db_retries, max_db_retries)
+                    time.sleep(wait_time)
+                    
+            except Exception as e:
+                logger.error("Unexpected error for batch of %d campgrounds: %s", len(batch), e)
+                error_count += len(batch)
+                break
+        
+    return inserted_count, updated_count, error_count
+
+def build_campgrounds(raw_campgrounds, build):
+    """
+    Build Campground models one record at a time, keeping the records that build returns.
+    
+    Args:
+        raw_campgrounds: List of raw API records
+        build: validate_campground or construct_campground
+        
+    Returns:
+        Tuple of (list of Campground models, number of records that were rejected)
+    """
+    campgrounds = []
+    rejected = 0
+    for campground_data in raw_campgrounds:
+        campground = build(campground_data)
+        if campground:
+            campgrounds.append(campground)
+        else:
+            rejected += 1
+            logger.warning("Failed to process campground data (ID: %s) - Data: %s", campground_data.get('id', 'unknown'), campground_data) # Added data for better debugging
+    return campgrounds, rejected
+
+def process_campgrounds(raw_campgrounds):
+    """
+    Validate and geocode a page (or any list) of raw campground records.
+    The whole list is validated in one TypeAdapter call; if any record is invalid,
+    the records are validated one by one so the valid ones are kept. With FAST_PARSE
+    only the first record is validated and the rest are taken as they are, except
+    records missing a required value.
+    
+    Returns:
+        Tuple of (list of Campground models, number of records that failed processing)
+    """
+    processing_errors = 0
+    
+    logger.debug("Processing %d campground records...", len(raw_campgrounds))
+    
+    # With FAST_PARSE the first record of the page is still validated as a schema check;
+    # if the API shape has drifted, the page falls back to full validation below
+    if FAST_PARSE and raw_campgrounds and validate_campground(raw_campgrounds[0]) is not None:
+        final_campgrounds, processing_errors = build_campgrounds(raw_campgrounds, construct_campground)
+    else:
+        try:
+            final_campgrounds = CAMPGROUND_LIST_ADAPTER.validate_python(
+                [build_campground_dict(campground_data) for campground_data in raw_campgrounds]
+            )
+        except Exception:
+            final_campgrounds, processing_errors = build_campgrounds(raw_campgrounds, validate_campground)
+    
+    # Geocoding phase, only for records that passed validation. The page is resolved as one
+    # batch: persisted addresses are read in a single query and the misses fetched concurrently.
+    add_addresses(final_campgrounds)
+    
+    return final_campgrounds, processing_errors
+
+def log_region_summary(bbox, start_time, total_raw, total_processed, pages_scanned,
+                       inserted, updated, processing_errors, db_errors):
+    """
+    Log the end-of-scan report for one region.
+    """
+    api_errors = 0
+    duration = time.time() - start_time
+    
+    logger.info(f"\nScan summary for region {bbox}:")
+    logger.info(f"  Total runtime: {duration:.2f} seconds")
+    logger.info(f"  Campgrounds found: {total_raw}")
+    logger.info(f"  Campgrounds processed: {total_processed}")
+    logger.info(f"  Pages scanned: {pages_scanned}")
+    logger.info(f"  Inserted: {inserted}")
+    logger.info(f"  Updated: {updated}")
+    logger.info(f"  API errors: {api_errors}")
+    logger.info(f"  Processing errors: {processing_errors}")
+    logger.info(f"  Database errors: {db_errors}")
+    logger.info(f"  Total errors: {api_errors + processing_errors + db_errors}")
+
+def save_chunk(chunk, page_keys, totals):
+    """
+    Upsert one chunk of processed campgrounds and add its counts to totals,
+    a [inserted, updated, db_errors] list. Errors are logged and counted, never raised,
+    so the writer keeps going.
+    
+    The page_cache validators of the pages in the chunk (page_keys) are only persisted
+    when every record was saved, so failed pages are fetched in full on the next run.
+    """
+    try:
+        counts = save_to_database(chunk) if chunk else (0, 0, 0)
+    except Exception as e:
+        logger.error("Error saving chunk of %d campgrounds: %s", len(chunk), e, exc_info=True)
+        counts = (0, 0, len(chunk))
+    for i, count in enumerate(counts):
+        totals[i] += count
+    
+    if counts[2]:
+        page_cache.discard(page_keys)
+    else:
+        page_cache.commit(page_keys)
+
+def write_chunks(save_queue, totals):
+    """
+    Database writer side of scrape_region: save each (chunk, page_keys) item put on save_queue
+    until None arrives.
+    """
+    while (item := save_queue.get()) is not None:
+        save_chunk(*item, totals)
+
+def fetch_pages(bbox, max_pages, page_queue, stop_event):
+    """
+    Producer side of scrape_region: fetch the pages of a region and put each non-empty page
+    on page_queue as a (page, data) pair (in page order), followed by None once the region is exhausted, max_pages
+    is reached or stop_event is set by the consumer.
+    
+    The remaining pages are requested by PAGE_FETCH_WORKERS threads over a sliding window of
+    PAGE_FETCH_WORKERS pages, up to the page count announced by the first page or, without one,
+    until a short or empty page comes back. Requests are started at most one per PAGE_REQUEST_INTERVAL
+    by a rate limiter instead of a fixed sleep, so time spent waiting on a full queue or on a slow
+    response counts towards the interval.
+    """
+    rate_limiter = RateLimiter(PAGE_REQUEST_INTERVAL)
+    
+    def fetch(page):
+        # Pages still queued on the executor after a stop are skipped
+        if stop_event.is_set():
+            return None
+        rate_limiter.wait()
+        logger.debug("Fetching page %s...", page)
+        return get_campgrounds(bbox, page=page, page_size=PAGE_SIZE)
+    
     try:
-        logger.info(f"Database connection established")
+        rate_limiter.wait()
+        logger.debug("Fetching page 1...")
+        body = get_search_page(bbox, page=1, page_size=PAGE_SIZE)
+        data = body.get("data", [])
         
-        for campground in campgrounds:
-            # Simple retry mechanism for each database operation
-            max_db_retries = 3
-            db_retries = 0
-            success = False
+        if data is None:
+            logger.debug("Page 1 unchanged since the last run")
+        elif not data:
+            logger.warning("No data retrieved from first page. Region might be empty or API issues.")
+            return
+        else:
+            logger.debug("Retrieved %d campgrounds from page 1", len(data))
+            page_queue.put((1, data))
+            # A short page is the last one, so there is nothing more to request
+            if len(data) < PAGE_SIZE:
+                logger.info("Region fits in a single page, scan complete.")
+                return
+        
+        last_page = get_page_count(body.get("meta", {}), PAGE_SIZE)
+        page_count_known = last_page is not None
+        
+        if page_count_known:
+            if max_pages is not None and last_page > max_pages:
+                logger.info(f"Reached maximum number of pages ({max_pages}). Stopping scan for this region.")
+                last_page = max_pages
+            logger.info(f"Fetching pages 2-{last_page} with {PAGE_FETCH_WORKERS} workers")
+        else:
+            last_page = max_pages
+        
+        # Keep a window of PAGE_FETCH_WORKERS pages in flight (up to last_page, if there is one) and
+        # consume them in order, so finished pages never pile up behind a full page_queue.
+        # Stop at the first short page, or at the first empty one when the page count is unknown
+        # (requests already started past it are discarded).
+        next_page = 2
+        window = collections.deque()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+            def fill_window():
+                nonlocal next_page
+                while len(window) < PAGE_FETCH_WORKERS and (last_page is None or next_page <= last_page):
+                    window.append((next_page, executor.submit(fetch, next_page)))
+                    next_page += 1
             
-            while not success and db_retries < max_db_retries:
-                try:
-                    # Check if the campground already exists
-                    existing = db.query(CampgroundDB).filter(CampgroundDB.id == campground.id).first()
-                    
-                    if existing:
-                        # Update existing record
-                        existing.name = campground.name
-                        existing.type = campground.type
-                        existing.links_self = str(campground.links.self)
-                        existing.latitude = campground.latitude
-                        existing.longitude = campground.longitude
-                        existing.region_name = campground.region_name
-                        existing.administrative_area = campground.administrative_area
-                        existing.nearest_city_name = campground.nearest_city_name
-                        existing.accommodation_type_names = campground.accommodation_type_names
-                        existing.bookable = campground.bookable
-                        existing.camper_types = campground.camper_types
-                        existing.operator = campground.operator
-                        existing.photo_url = str(campground.photo_url) if campground.photo_url else None
-                        existing.photo_urls = [str(url) for url in campground.photo_urls] if campground.photo_urls else []
-                        existing.photos_count = campground.photos_count
-                        existing.rating = campground.rating
-                        existing.reviews_count = campground.reviews_count
-                        existing.slug = campground.slug
-                        existing.price_low = campground.price_low
-                        existing.price_high = campground.price_high
-                        existing.availability_updated_at = campground.availability_updated_at
-                        existing.address = campground.address
-                        
-                        updated_count += 1
-                        logger.info(f"Updated: {campground.name} (ID: {campground.id})")
-                    else:
-                        # Create new record
-                        db_campground = CampgroundDB(
-                            id=campground.id,
-                            type=campground.type,
-                            links_self=str(campground.links.self),
-                            name=campground.name,
-                            latitude=campground.latitude,
-                            longitude=campground.longitude,
-                            region_name=campground.region_name,
-                            administrative_area=campground.administrative_area,
-                            nearest_city_name=campground.nearest_city_name,
-                            accommodation_type_names=campground.accommodation_type_names,
-                            bookable=campground.bookable,
-                            camper_types=campground.camper_types,
-                            operator=campground.operator,
-                            photo_url=str(campground.photo_url) if campground.photo_url else None,
-                            photo_urls=[str(url) for url in campground.photo_urls] if campground.photo_urls else [],
-                            photos_count=campground.photos_count,
-                            rating=campground.rating,
-                            reviews_count=campground.reviews_count,
-                            slug=campground.slug,
-                            price_low=campground.price_low,
-                            price_high=campground.price_high,
-                            availability_updated_at=campground.availability_updated_at,
-                            address=campground.address
-                        )
-                        db.add(db_campground)
-                        inserted_count += 1
-                        logger.info(f"Inserted: {campground.name} (ID: {campground.id})")
-                    
-                    # Try to commit each record individually to avoid losing all on a single error
-                    db.commit()
-                    success = True
-                    
-                except SQLAlchemyError as e:
-                    db.rollback()
-                    db_retries += 1
-                    wait_time = 0.5 * db_retries
-                    
-                    if db_retries >= max_db_retries:
-                        logger.error(f"Database error for campground {campground.id} after {max_db_retries} attempts: {str(e)}")
-                        error_count += 1
-                    else:
-                        logger.warning(f"Database error for campground {campground.id}, retrying... (Attempt {db_retries}/{max_db_retries})")
-                        time.sleep(wait_time)
-                        
-                except Exception as e:
-                    db.rollback()
-                    logger.error(f"Unexpected error for campground {campground.id}: {str(e)}")
-                    error_count += 1
+            fill_window()
+            while window:
+                if stop_event.is_set():
                     break
-                    
+                page, future = window.popleft()
+                data = future.result()
+                
+                # None means the page is unchanged, and an empty page within a known page count
+                # a failed request: skip those, but keep scanning
+                if data:
+                    logger.debug("Retrieved %d campgrounds from page %s", len(data), page)
+                    page_queue.put((page, data))
+                    if len(data) < PAGE_SIZE:
+                        logger.info("Reached the last page, scan complete.")
+                        break
+                elif data is not None and not page_count_known:
+                    logger.info("No more data to fetch, scan complete.")
+                    break
+                fill_window()
+            else:
+                if not page_count_known:
+                    logger.info(f"Reached maximum number of pages ({max_pages}). Stopping scan for this region.")
+            
+            for _, future in window:
+                future.cancel()
     except Exception as e:
-        db.rollback()
-        logger.error(f"Critical database error: {str(e)}")
+        logger.error(f"Error while fetching pages: {str(e)}", exc_info=True)
     finally:
-        db.close()
-        
-    return inserted_count, updated_count, error_count
+        page_queue.put(None)
 
 def scrape_region(bbox, max_pages=None):
+    """
+    Scrape one region as a pipeline: a fetcher thread downloads pages into a small queue
+    while this thread validates and geocodes the pages already received, and a writer thread
+    upserts the processed campgrounds every SAVE_CHUNK_SIZE records, so fetching, processing
+    and database writes overlap.
+    """
     logger.info(f"Starting scan for region with bbox: {bbox}")
     
     start_time = time.time()
-    raw_campgrounds = []
-    final_campgrounds = []
-    page = 1
-    api_errors = 0
+    total_raw = 0
+    total_processed = 0
     processing_errors = 0
-    db_errors = 0
+    pages_scanned = 0
+    totals = [0, 0, 0]  # inserted, updated, db_errors; updated by the writer thread
+    chunk = []
+    page_keys = []  # page_cache keys of the pages in chunk
+    
+    page_queue = queue.Queue(maxsize=PAGE_QUEUE_SIZE)
+    stop_fetching = threading.Event()
+    fetcher = threading.Thread(
+        target=fetch_pages,
+        args=(bbox, max_pages, page_queue, stop_fetching),
+        name="page-fetcher",
+        daemon=True
+    )
+    save_queue = queue.Queue(maxsize=SAVE_QUEUE_SIZE)
+    writer = threading.Thread(
+        target=write_chunks,
+        args=(save_queue, totals),
+        name="db-writer",
+        daemon=True
+    )
+    fetcher.start()
+    writer.start()
     
     try:
-        # Data collection phase
-        while True:
-            logger.info(f"Fetching page {page}...")
+        # Data processing phase, overlapping with the fetches still in progress
+        while (item := page_queue.get()) is not None:
+            page, data = item
+            pages_scanned += 1
+            total_raw += len(data)
+            campgrounds, errors = process_campgrounds(data)
+            total_processed += len(campgrounds)
+            processing_errors += errors
             
-            data = get_campgrounds(bbox, page=page, page_size=20)  
-            
-            if not data:
-                if page == 1:
-                    logger.warning("No data retrieved from first page. Region might be empty or API issues.")
-                else:
-                    logger.info("No more data to fetch, scan complete.")
-                break
-            
-            raw_campgrounds.extend(data)
-            logger.info(f"Retrieved {len(data)} campgrounds from page {page}")
-            page += 1
-
-            # Rate limiting
-            time.sleep(2) 
+            chunk.extend(campgrounds)
+            page_keys.append(page_cache_key(bbox, page, PAGE_SIZE))
+            if len(chunk) >= SAVE_CHUNK_SIZE:
+                save_queue.put((chunk, page_keys))
+                chunk = []
+                page_keys = []
+        
+        fetcher.join()
+        if page_keys:
+            save_queue.put((chunk, page_keys))
+    except Exception as e:
+        logger.error(f"Critical error during scan: {str(e)}", exc_info=True)
+        # Stop the fetcher and drain the queue, so it isn't left blocked on a full page_queue
+        stop_fetching.set()
+        while page_queue.get() is not None:
+            pass
+        return total_raw, 0, 0, 0
+    finally:
+        # Let the writer finish the chunks already queued
+        save_queue.put(None)
+        writer.join()
+    
+    inserted, updated, db_errors = totals
+    if not total_processed:
+        logger.warning(f"No campgrounds to save for region {bbox}!")
+        return total_raw, 0, 0, 0
+    
+    log_region_summary(bbox, start_time, total_raw, total_processed, pages_scanned,
+                       inserted, updated, processing_errors, db_errors)
+    return total_raw, total_processed, inserted, updated
 
-            # Optional page limit if specified
-            if max_pages is not None and page > max_pages:
+async def fetch_pages_async(client, bbox, max_pages, page_queue):
+    """
+    Async producer for scrape_region_async, mirroring fetch_pages: put each non-empty page
+    on page_queue (an asyncio.Queue, as (page, data) pairs in page order), followed by None once the region is
+    exhausted or max_pages is reached. Up to PAGE_FETCH_WORKERS requests are in flight at once,
+    in a sliding window over the pages.
+    """
+    # Rate limiting per region, without blocking the other regions
+    rate_limiter = RateLimiter(PAGE_REQUEST_INTERVAL)
+    # (page, task) pairs in flight; at most PAGE_FETCH_WORKERS requests run at once
+    window = collections.deque()
+    
+    async def fetch(page):
+        await rate_limiter.wait_async()
+        logger.debug("Fetching page %s...", page)
+        return await get_campgrounds_async(client, bbox, page=page, page_size=PAGE_SIZE)
+    
+    try:
+        await rate_limiter.wait_async()
+        logger.debug("Fetching page 1...")
+        body = await get_search_page_async(client, bbox, page=1, page_size=PAGE_SIZE)
+        data = body.get("data", [])
+        
+        if data is None:
+            logger.debug("Page 1 unchanged since the last run")
+        elif not data:
+            logger.warning("No data retrieved from first page. Region might be empty or API issues.")
+            return
+        else:
+            logger.debug("Retrieved %d campgrounds from page 1", len(data))
+            await page_queue.put((1, data))
+            # A short page is the last one, so there is nothing more to request
+            if len(data) < PAGE_SIZE:
+                logger.info("Region fits in a single page, scan complete.")
+                return
+        
+        last_page = get_page_count(body.get("meta", {}), PAGE_SIZE)
+        page_count_known = last_page is not None
+        
+        if page_count_known:
+            if max_pages is not None and last_page > max_pages:
                 logger.info(f"Reached maximum number of pages ({max_pages}). Stopping scan for this region.")
-                break
+                last_page = max_pages
+        else:
+            last_page = max_pages
         
-        # Data processing phase
-        logger.info(f"Processing {len(raw_campgrounds)} campground records...")
+        # Keep a window of PAGE_FETCH_WORKERS pages in flight (up to last_page, if there is one) and
+        # consume them in order, so finished pages never pile up behind a full page_queue.
+        # Stop at the first short page, or at the first empty one when the page count is unknown
+        # (requests still running past it are cancelled).
+        next_page = 2
         
-        for i, campground_data in enumerate(raw_campgrounds):
-            try:
-                campground = process_campground(campground_data)
-                if campground:
-                    final_campgrounds.append(campground)
-                    if (i+1) % 20 == 0:  # Log every 20 records
-                        logger.info(f"Processing: {i+1}/{len(raw_campgrounds)}")
-                else:
-                    processing_errors += 1
-                    logger.warning(f"Failed to process campground data (ID: {campground_data.get('id', 'unknown')}) - Data: {campground_data}") # Added data for better debugging
-            except Exception as e:
-                processing_errors += 1
-                logger.error(f"Error processing campground: {e}", exc_info=True) # Added exc_info for traceback
-        
-        # Database saving phase
-        if final_campgrounds:
-            logger.info(f"\nSaving {len(final_campgrounds)} campgrounds to database...")
-            inserted, updated, errors = save_to_database(final_campgrounds)
-            db_errors = errors
-            
-            # Summary report
-            end_time = time.time()
-            duration = end_time - start_time
-            
-            logger.info(f"\nScan summary for region {bbox}:")
-            logger.info(f"  Total runtime: {duration:.2f} seconds")
-            logger.info(f"  Campgrounds found: {len(raw_campgrounds)}")
-            logger.info(f"  Campgrounds processed: {len(final_campgrounds)}")
-            logger.info(f"  Pages scanned: {page-1}")
-            logger.info(f"  Inserted: {inserted}")
-            logger.info(f"  Updated: {updated}")
-            logger.info(f"  API errors: {api_errors}")
-            logger.info(f"  Processing errors: {processing_errors}")
-            logger.info(f"  Database errors: {db_errors}")
-            logger.info(f"  Total errors: {api_errors + processing_errors + db_errors}")
+        def fill_window():
+            nonlocal next_page
+            while len(window) < PAGE_FETCH_WORKERS and (last_page is None or next_page <= last_page):
+                window.append((next_page, asyncio.create_task(fetch(next_page))))
+                next_page += 1
+        
+        fill_window()
+        while window:
+            page, task = window.popleft()
+            data = await task
             
-            return len(raw_campgrounds), len(final_campgrounds), inserted, updated
+            # None means the page is unchanged, and an empty page within a known page count
+            # a failed request: skip those, but keep scanning
+            if data:
+                logger.debug("Retrieved %d campgrounds from page %s", len(data), page)
+                await page_queue.put((page, data))
+                if len(data) < PAGE_SIZE:
+                    logger.info("Reached the last page, scan complete.")
+                    break
+            elif data is not None and not page_count_known:
+                logger.info("No more data to fetch, scan complete.")
+                break
+            fill_window()
         else:
-            logger.warning(f"No campgrounds to save for region {bbox}!")
+            if not page_count_known:
+                logger.info(f"Reached maximum number of pages ({max_pages}). Stopping scan for this region.")
+    except Exception as e:
+        logger.error(f"Error while fetching pages: {str(e)}", exc_info=True)
+    finally:
+        for _, task in window:
+            task.cancel()
+        await page_queue.put(None)
 
+async def write_chunks_async(save_queue, totals):
+    """
+    Async database writer for scrape_region_async: save each (chunk, page_keys) item put
+    on save_queue in a worker thread until None arrives.
+    """
+    while (item := await save_queue.get()) is not None:
+        await asyncio.to_thread(save_chunk, *item, totals)
+
+async def scrape_region_async(client, bbox, max_pages=None):
+    """
+    Async variant of scrape_region: pages are fetched on the event loop with the shared client,
+    and each page is validated and geocoded in a worker thread as soon as it arrives, while
+    later pages are still downloading. A writer task upserts the processed campgrounds (also in
+    a worker thread) every SAVE_CHUNK_SIZE records, without holding up processing.
+    """
+    logger.info(f"Starting scan for region with bbox: {bbox}")
+    
+    start_time = time.time()
+    total_raw = 0
+    total_processed = 0
+    processing_errors = 0
+    pages_scanned = 0
+    totals = [0, 0, 0]  # inserted, updated, db_errors; updated by the writer task
+    chunk = []
+    page_keys = []  # page_cache keys of the pages in chunk
+    
+    page_queue = asyncio.Queue(maxsize=PAGE_QUEUE_SIZE)
+    save_queue = asyncio.Queue(maxsize=SAVE_QUEUE_SIZE)
+    fetcher = asyncio.create_task(fetch_pages_async(client, bbox, max_pages, page_queue))
+    writer = asyncio.create_task(write_chunks_async(save_queue, totals))
+    
+    try:
+        # Data processing phase, overlapping with the fetches still in progress
+        while (item := await page_queue.get()) is not None:
+            page, data = item
+            pages_scanned += 1
+            total_raw += len(data)
+            campgrounds, errors = await asyncio.to_thread(process_campgrounds, data)
+            total_processed += len(campgrounds)
+            processing_errors += errors
+            
+            chunk.extend(campgrounds)
+            page_keys.append(page_cache_key(bbox, page, PAGE_SIZE))
+            if len(chunk) >= SAVE_CHUNK_SIZE:
+                await save_queue.put((chunk, page_keys))
+                chunk = []
+                page_keys = []
+        
+        await fetcher
+        if page_keys:
+            await save_queue.put((chunk, page_keys))
     except Exception as e:
         logger.error(f"Critical error during scan: {str(e)}", exc_info=True)
+        return total_raw, 0, 0, 0
+    finally:
+        fetcher.cancel()
+        # Let the writer finish the chunks already queued
+        await save_queue.put(None)
+        await writer
+    
+    inserted, updated, db_errors = totals
+    if not total_processed:
+        logger.warning(f"No campgrounds to save for region {bbox}!")
+        return total_raw, 0, 0, 0
+    
+    log_region_summary(bbox, start_time, total_raw, total_processed, pages_scanned,
+                       inserted, updated, processing_errors, db_errors)
+    return total_raw, total_processed, inserted, updated
+
+async def parallel_scrape_regions_async(regions=FOUR_MAIN_US_REGIONS, max_pages=None, max_concurrency=16):
+    """
+    Scrapes multiple regions concurrently on one event loop.
+    All regions share a single HTTP/2 httpx.AsyncClient, so connections to the API are reused across them.
+    
+    Args:
+        regions: List of bounding boxes to scrape (defaults to 4 main US regions)
+        max_pages: Maximum number of pages to scrape per region
+        max_concurrency: Maximum number of regions scraped at the same time (at least 1)
+        
+    Returns:
+        Tuple of (total_raw, total_processed, total_inserted, total_updated) counts
+    """
+    # A semaphore of 0 would block every region forever
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+    
+    start_time = time.time()
+    logger.info(f"Starting parallel scan of {len(regions)} regions with up to {max_concurrency} concurrent regions")
+    
+    # Create database tables if they don't exist
+    await asyncio.to_thread(create_tables)
+    
+    total_raw = 0
+    total_processed = 0
+    total_inserted = 0
+    total_updated = 0
+    failed_regions = []
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    # HTTP/2 multiplexes the concurrent page requests of all regions over one connection
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=DEFAULT_HEADERS,
+        timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0]),
+        limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    ) as client:
+        
+        async def scrape_bounded(region):
+            async with semaphore:
+                return await scrape_region_async(client, region, max_pages)
+        
+        results = await asyncio.gather(
+            *[scrape_bounded(region) for region in regions],
+            return_exceptions=True
+        )
+    
+    for region, result in zip(regions, results):
+        if isinstance(result, Exception):
+            failed_regions.append(region)
+            logger.error(f"Failed to scrape region {region}: {str(result)}")
+            continue
         
-    return len(raw_campgrounds), 0, 0, 0
+        raw, processed, inserted, updated = result
+        total_raw += raw
+        total_processed += processed
+        total_inserted += inserted
+        total_updated += updated
+        
+        # Check if the completed region is one of the 4 main regions for logging clarity
+        region_name = "a main US region" if region in FOUR_MAIN_US_REGIONS else "a custom region"
+        logger.info(f"Completed scraping {region_name} (bbox: {region}): {raw} found, {processed} processed, {inserted} inserted, {updated} updated")
+    
+    # Summarize results
+    end_time = time.time()
+    duration = end_time - start_time
+    
+    logger.info(f"\nParallel scan summary:")
+    logger.info(f"  Total runtime: {duration:.2f} seconds")
+    logger.info(f"  Regions scanned: {len(regions)}")
+    logger.info(f"  Regions succeeded: {len(regions) - len(failed_regions)}")
+    logger.info(f"  Regions failed: {len(failed_regions)}")
+    logger.info(f"  Total campgrounds found: {total_raw}")
+    logger.info(f"  Total campgrounds processed: {total_processed}")
+    logger.info(f"  Total campgrounds inserted: {total_inserted}")
+    logger.info(f"  Total campgrounds updated: {total_updated}")
+    
+    if failed_regions:
+        logger.warning(f"Failed regions: {'; '.join(map(format_bbox, failed_regions))}")
+        
+    return total_raw, total_processed, total_inserted, total_updated
 
 def parallel_scrape_regions(regions=FOUR_MAIN_US_REGIONS, max_pages=None, max_workers=4):
     """
-    Scrapes multiple regions in parallel using a thread pool.
+    Scrapes multiple regions in parallel. Synchronous entry point for parallel_scrape_regions_async.
     
     Args:
         regions: List of bounding boxes to scrape in parallel (defaults to 4 main US regions)
         max_pages: Maximum number of pages to scrape per region
-        max_workers: Maximum number of worker threads
+        max_workers: Maximum number of regions scraped at the same time
         
     Returns:
         Tuple of (total_raw, total_processed, total_inserted, total_updated) counts
     """
     try:
-        start_time = time.time()
-        logger.info(f"Starting parallel scan of {len(regions)} regions with {max_workers} workers")
-        
-        # Create database tables if they don't exist
-        create_tables()
-        
-        total_raw = 0
-        total_processed = 0
-        total_inserted = 0
-        total_updated = 0
-        failed_regions = []
-        
-        # Adjust worker count if needed
-        actual_workers = min(max_workers, len(regions))
-        
-        # Create thread pool
-        with concurrent.futures.ThreadPoolExecutor(max_workers=actual_workers) as executor:
-            # Start scraping all regions in parallel
-            future_to_region = {
-                executor.submit(scrape_region, region, max_pages): region 
-                for region in regions
-            }
-            
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_region):
-                region = future_to_region[future]
-                try:
-                    raw, processed, inserted, updated = future.result()
-                    total_raw += raw
-                    total_processed += processed
-                    total_inserted += inserted
-                    total_updated += updated
-                    
-                    # Check if the completed region is one of the 4 main regions for logging clarity
-                    region_name = "a main US region" if region in FOUR_MAIN_US_REGIONS else "a custom region"
-                    logger.info(f"Completed scraping {region_name} (bbox: {region}): {raw} found, {processed} processed, {inserted} inserted, {updated} updated")
-                except Exception as e:
-                    failed_regions.append(region)
-                    logger.error(f"Failed to scrape region {region}: {str(e)}")
-        
-        # Summarize results
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        logger.info(f"\nParallel scan summary:")
-        logger.info(f"  Total runtime: {duration:.2f} seconds")
-        logger.info(f"  Regions scanned: {len(regions)}")
-        logger.info(f"  Regions succeeded: {len(regions) - len(failed_regions)}")
-        logger.info(f"  Regions failed: {len(failed_regions)}")
-        logger.info(f"  Total campgrounds found: {total_raw}")
-        logger.info(f"  Total campgrounds processed: {total_processed}")
-        logger.info(f"  Total campgrounds inserted: {total_inserted}")
-        logger.info(f"  Total campgrounds updated: {total_updated}")
-        
-        if failed_regions:
-            logger.warning(f"Failed regions: {', '.join(failed_regions)}")
-            
-        return total_raw, total_processed, total_inserted, total_updated
-        
+        return asyncio.run(parallel_scrape_regions_async(regions, max_pages, max_concurrency=max_workers))
     except Exception as e:
         logger.error(f"Critical error in parallel scraping: {str(e)}", exc_info=True)
         return 0, 0, 0, 0
@@ -508,6 +1081,10 @@ def main(max_pages=10, bbox=US_BOUNDS, parallel=False, max_workers=4):
         return 0, 0, 0, 0
 
 if __name__ == "__main__":
-    # Default run: Parallel US scan with 10 page limit per region and default 4 workers
-    main(max_pages=10, parallel=True)
+    log_listener = setup_logging()
+    try:
+        # Default run: Parallel US scan with 10 page limit per region and default 4 workers
+        main(max_pages=10, parallel=True)
+    finally:
+        log_listener.stop()
     
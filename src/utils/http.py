@@ -0,0 +1,51 @@
+import requests
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+
+def create_session(headers=None, pool_maxsize=10, max_retries=0):
+    """
+    Build a requests.Session with a pooled HTTPAdapter.
+    
+    Keeping one session per upstream service lets consecutive requests reuse keep-alive
+    connections instead of paying a new TCP/TLS handshake on every call.
+    
+    Args:
+        headers: Default headers sent with every request
+        pool_maxsize: Connections kept open per host; match it to the number of threads using the session
+        max_retries: Retry count or urllib3 Retry object passed to the adapter
+        
+    Returns:
+        The configured requests.Session
+    """
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+    
+    adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def retry_after_seconds(headers, default):
+    """
+    Seconds to wait according to a response's Retry-After header.
+    
+    Args:
+        headers: Case-insensitive response headers (requests or httpx)
+        default: Value returned when the header is missing or can't be parsed
+        
+    Returns:
+        The delay in seconds, never negative
+    """
+    value = headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
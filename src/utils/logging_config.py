@@ -0,0 +1,45 @@
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+def setup_logging(level=logging.INFO):
+    """
+    Configure root logging for the scraper and the API.
+    
+    Records are put on a queue by the calling thread and written to the console and a daily
+    log file (logs/scraper_YYYYMMDD.log) by a background QueueListener, so slow log sinks
+    never block request handlers or scraper threads.
+    
+    Args:
+        level: Root log level
+        
+    Returns:
+        The started QueueListener; call stop() on shutdown to flush pending records
+    """
+    # Create logs directory
+    logs_dir = os.path.join(os.getcwd(), 'logs')
+    os.makedirs(logs_dir, exist_ok=True)
+    
+    # Create log file with today's date
+    log_filename = os.path.join(logs_dir, f'scraper_{datetime.now().strftime("%Y%m%d")}.log')
+    
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.FileHandler(log_filename), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    
+    listener.start()
+    return listener
@@ -0,0 +1,90 @@
+import atexit
+import shelve
+import threading
+
+class ValidatorCache:
+    """
+    ETag / Last-Modified validators of previously fetched pages, persisted in a shelve file
+    so later runs can send conditional requests. Each entry also keeps the JSON:API meta
+    block of the response, since a 304 response has no body to read it from.
+
+    Validators of a fresh response are only staged in memory at first, and written by
+    commit() once the page's records are saved. Otherwise a failed save would leave a
+    validator behind, and the next run would get a 304 for records that were never stored.
+
+    Without a path the cache is disabled: lookups return None and nothing is stored.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._shelf = None
+        self._staged = {}
+
+    def _open(self):
+        # Called with the lock held; the file is only created once something uses it
+        if self._shelf is None:
+            self._shelf = shelve.open(self.path)
+            atexit.register(self.close)
+        return self._shelf
+
+    def get(self, key):
+        """
+        Return the stored entry for a key ({"etag", "last_modified", "meta"}), or None.
+        """
+        if not self.path:
+            return None
+        with self._lock:
+            return self._open().get(key)
+
+    def stage(self, key, response_headers, meta):
+        """
+        Hold the validators of a successful response until commit(); responses without any are skipped.
+
+        Args:
+            key: Cache key of the request
+            response_headers: Case-insensitive response headers (requests or httpx)
+            meta: JSON:API meta block of the response body
+        """
+        if not self.path:
+            return
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        with self._lock:
+            self._staged[key] = {"etag": etag, "last_modified": last_modified, "meta": meta}
+
+    def commit(self, keys):
+        """Persist the staged entries of keys whose records have been saved."""
+        if not self.path:
+            return
+        with self._lock:
+            entries = {key: self._staged.pop(key) for key in keys if key in self._staged}
+            if entries:
+                self._open().update(entries)
+
+    def discard(self, keys):
+        """Drop the staged entries of keys whose records could not be saved."""
+        with self._lock:
+            for key in keys:
+                self._staged.pop(key, None)
+
+    def close(self):
+        """Flush and close the shelve file."""
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+
+def conditional_headers(entry):
+    """
+    If-None-Match / If-Modified-Since headers for a cached entry (empty if there is none).
+    """
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
@@ -0,0 +1,42 @@
+import asyncio
+import time
+from threading import Lock
+
+class RateLimiter:
+    """
+    Spaces calls at least `interval` seconds apart across all callers.
+    
+    Each caller reserves the next free time slot under a short lock and then sleeps until it,
+    so concurrent workers share one global request rate instead of each sleeping on its own.
+    The limiter holds no event loop state and can be used from threads and from any loop.
+    """
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = Lock()
+    
+    def _reserve(self):
+        """Claim the next slot and return how long the caller has to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            return slot - now
+    
+    def pause(self, seconds):
+        """Hold back every caller's next slot for at least `seconds`, e.g. after a 429 response."""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+    
+    def wait(self):
+        """Block the calling thread until its slot comes up."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_async(self):
+        """Suspend the calling task until its slot comes up."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)